@@ -1,13 +1,28 @@
-import { ApolloClient, InMemoryCache } from '@apollo/client'
+import { ApolloClient, HttpLink, InMemoryCache } from '@apollo/client'
+import { createPersistedQueryLink } from '@apollo/client/link/persisted-queries'
 import Cookie from 'js-cookie'
 
-export default new ApolloClient({
+// Queries are sent by hash first; the server falls back to asking for the full text if it doesn't know the hash
+const sha256 = async query => {
+  const digest = await window.crypto.subtle.digest('SHA-256', new TextEncoder().encode(query))
+  return Array.from(new Uint8Array(digest))
+    .map(byte => byte.toString(16).padStart(2, '0'))
+    .join('')
+}
+
+const httpLink = new HttpLink({
   uri: '/graphql',
-  cache: new InMemoryCache(),
-  assumeImmutableResults: false,
   headers: {
     Accept: 'application/json',
     'X-Requested-With': 'XMLHttpRequest',
     'X-CSRFToken': Cookie.get('csrftoken')
   }
 })
+
+const persistedQueryLink = createPersistedQueryLink({ sha256 })
+
+export default new ApolloClient({
+  link: persistedQueryLink.concat(httpLink),
+  cache: new InMemoryCache(),
+  assumeImmutableResults: false
+})
@@ -0,0 +1,19 @@
+"""
+ASGI config for dashboard project, used instead of dashboard.wsgi when ASGI is enabled.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+from debug_utils.debugpy import check_and_enable_debugpy
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dashboard.settings")
+
+check_and_enable_debugpy()
+
+application = get_asgi_application()
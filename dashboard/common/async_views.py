@@ -0,0 +1,37 @@
+# Async versions of sync views, used when the application is served over ASGI
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+
+logger = logging.getLogger(__name__)
+
+# Threads only start on the first request, so a preloading gunicorn master forks before any exist
+view_executor = ThreadPoolExecutor(max_workers=settings.ASGI_THREADS, thread_name_prefix='view')
+
+
+def run_in_thread(view, request, *args, **kwargs):
+    # Each thread keeps its own database connection; close it when it is too old or broken, as Django does around
+    # each request for the thread it runs sync views in
+    close_old_connections()
+    try:
+        return view(request, *args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+def threaded_async_view(view):
+    """
+    Wraps a sync view (including its login and permission decorators) in an async view that runs it in a thread
+    of view_executor. Django otherwise runs every sync view of an ASGI worker in the same single thread, one request
+    at a time, so a slow query would hold up all the others.
+    """
+    @functools.wraps(view)
+    async def async_view(request, *args, **kwargs):
+        return await sync_to_async(run_in_thread, thread_sensitive=False, executor=view_executor)(
+            view, request, *args, **kwargs)
+    return async_view
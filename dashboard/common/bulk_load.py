@@ -0,0 +1,114 @@
+# Writers used by the cron to append DataFrames to MySQL tables
+import logging
+import os
+import tempfile
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+
+logger = logging.getLogger(__name__)
+
+# LOAD DATA reads \N as NULL; backslashes, tabs and line breaks inside values are escaped so they round trip
+NULL_MARKER = '\\N'
+TSV_ESCAPES = (('\\', '\\\\'), ('\t', '\\t'), ('\n', '\\n'), ('\r', '\\r'))
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+
+def escape_tsv_value(value) -> str:
+    if isinstance(value, bool):
+        return str(int(value))
+    value = str(value)
+    for character, escaped in TSV_ESCAPES:
+        value = value.replace(character, escaped)
+    return value
+
+
+def column_as_tsv_text(series: pd.Series) -> pd.Series:
+    """Formats a column the way LOAD DATA's default field and line options expect it"""
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        # MySQL DATETIME columns hold naive UTC values, the same as Django writes them
+        series = series.dt.tz_convert('UTC').dt.tz_localize(None)
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        tsv_text = series.dt.strftime(DATETIME_FORMAT)
+    elif pd.api.types.is_bool_dtype(series):
+        tsv_text = series.astype('Int8').astype('string')
+    elif pd.api.types.is_numeric_dtype(series):
+        tsv_text = series.astype('string')
+    else:
+        tsv_text = series.map(escape_tsv_value, na_action='ignore')
+    return tsv_text.astype(object).where(series.notna(), NULL_MARKER)
+
+
+def write_tsv(df: pd.DataFrame, tsv_file) -> None:
+    columns = [column_as_tsv_text(df[column]) for column in df.columns]
+    lines = columns[0].str.cat(columns[1:], sep='\t') if len(columns) > 1 else columns[0]
+    tsv_file.write('\n'.join(lines))
+    tsv_file.write('\n')
+
+
+def insert_ignore(pd_table, connection, keys, data_iter) -> int:
+    """DataFrame.to_sql insertion method that skips rows conflicting with a unique key, with INSERT IGNORE"""
+    rows = [dict(zip(keys, row)) for row in data_iter]
+    result = connection.execute(pd_table.table.insert().prefix_with('IGNORE'), rows)
+    return result.rowcount
+
+
+def load_data_infile(engine: Engine, df: pd.DataFrame, table_name: str, ignore_duplicates: bool = False) -> int:
+    """
+    Appends a DataFrame to a table by writing it to a temporary TSV file and running LOAD DATA LOCAL INFILE.
+    Both the MySQL server (local_infile=ON) and the engine's connection (local_infile=1) must allow it.
+    With ignore_duplicates, rows conflicting with a unique key are skipped. Otherwise the load is rolled back
+    and ValueError raised when MySQL skips any row: with LOCAL it only warns about them instead of failing.
+
+    :return: Number of rows MySQL reports as loaded
+    """
+    if df.empty:
+        return 0
+
+    column_list = ', '.join(f'`{column}`' for column in df.columns)
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', newline='', suffix='.tsv', delete=False) as tsv_file:
+        tsv_path = tsv_file.name
+        write_tsv(df, tsv_file)
+
+    ignore = 'IGNORE ' if ignore_duplicates else ''
+    try:
+        with engine.begin() as connection:
+            # Default field and line options: tab separated, backslash escaped, newline terminated
+            result = connection.execute(
+                text(f'LOAD DATA LOCAL INFILE :tsv_path {ignore}INTO TABLE `{table_name}` '
+                     f'CHARACTER SET utf8mb4 ({column_list})'),
+                {'tsv_path': tsv_path}
+            )
+            if result.rowcount != len(df) and not ignore_duplicates:
+                raise ValueError(f'LOAD DATA loaded {result.rowcount} of {len(df)} rows into {table_name}')
+    finally:
+        os.remove(tsv_path)
+
+    if result.rowcount != len(df):
+        logger.info(f'LOAD DATA skipped {len(df) - result.rowcount} duplicate rows of {len(df)} in {table_name}')
+    return result.rowcount
+
+
+def append_dataframe(engine: Engine, df: pd.DataFrame, table_name: str, bulk_load: bool = False,
+                     ignore_duplicates: bool = False) -> int:
+    """
+    Appends a DataFrame to a table, using LOAD DATA LOCAL INFILE when bulk_load is set and falling back to
+    DataFrame.to_sql when the server or connection does not allow it. With ignore_duplicates, rows conflicting
+    with a unique key are skipped instead of failing the insert.
+
+    :return: Number of rows written
+    """
+    if bulk_load:
+        try:
+            return load_data_infile(engine, df, table_name, ignore_duplicates)
+        except DBAPIError as e:
+            logger.warning(f'LOAD DATA into {table_name} failed, falling back to to_sql: {e}')
+
+    rows = df.to_sql(con=engine, name=table_name, if_exists='append', index=False,
+                     method=insert_ignore if ignore_duplicates else None)
+    # to_sql sums the rowcounts of its inserts, which leave out the rows INSERT IGNORE skipped
+    return len(df) if rows is None else rows
@@ -1,12 +1,10 @@
 # Some utility functions used by other classes in this project
 import logging
 import datetime
-from typing import Dict, List, Literal, TypedDict, Union
+from typing import TYPE_CHECKING, Dict, List, Literal, TypedDict, Union
 from urllib.parse import quote_plus
 
 import django
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
 from dateutil.parser import parse
 from django.conf import settings
 from django.contrib.auth.models import User as DjangoUser
@@ -14,6 +12,10 @@
 
 from dashboard.models import Course, User
 
+# SQLAlchemy is only used by the cron, so it is imported on first use rather than by every web worker
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
 
 logger = logging.getLogger(__name__)
 
@@ -29,17 +31,81 @@ class DjangoDBParams(TypedDict):
     PORT: int
 
 
-def create_sqlalchemy_engine(db_params: DjangoDBParams) -> Engine:
+def create_sqlalchemy_engine(db_params: DjangoDBParams, **engine_kwargs) -> 'Engine':
+    from sqlalchemy import create_engine
+
     new_db_params: DjangoDBParams = db_params.copy()
     new_db_params['PASSWORD'] = quote_plus(db_params['PASSWORD'])
 
     core_string = '{USER}:{PASSWORD}@{HOST}:{PORT}/{NAME}'.format(**new_db_params)
     if new_db_params['ENGINE'] == (BACKENDS_PATH + 'mysql'):
-        return create_engine(f'mysql+mysqldb://{core_string}?charset=utf8mb4')
+        return create_engine(f'mysql+mysqldb://{core_string}?charset=utf8mb4', **engine_kwargs)
     else:
         raise Exception("Only mysql is supported")
 
 
+# Engines shared by everything in a process that queries MyLA's database through SQLAlchemy, by name
+shared_engines: Dict[str, 'Engine'] = {}
+
+
+def get_shared_engine(name: str = 'default', **engine_kwargs) -> 'Engine':
+    """
+    Returns the process's pooled engine for the default database, creating it with the DB_POOL settings on first use.
+    Callers needing different connection arguments (e.g. the cron's bulk loading) use their own name.
+    """
+    if name not in shared_engines:
+        from dashboard.common.metered_pool import MeteredQueuePool
+
+        shared_engines[name] = create_sqlalchemy_engine(
+            settings.DATABASES['default'],
+            poolclass=MeteredQueuePool,
+            pool_size=settings.DB_POOL['SIZE'],
+            max_overflow=settings.DB_POOL['MAX_OVERFLOW'],
+            pool_timeout=settings.DB_POOL['TIMEOUT'],
+            pool_recycle=settings.DB_POOL['RECYCLE'],
+            pool_pre_ping=settings.DB_POOL['PRE_PING'],
+            **engine_kwargs
+        )
+    return shared_engines[name]
+
+
+def dispose_shared_engines() -> None:
+    """Closes the shared engines' pooled connections, e.g. before a preloaded gunicorn master forks a worker"""
+    for engine in shared_engines.values():
+        engine.dispose()
+    shared_engines.clear()
+
+
+def pool_metrics(engine: 'Engine') -> Dict[str, Union[int, float]]:
+    pool = engine.pool
+    return {
+        'size': pool.size(),
+        'checked_out': pool.checkedout(),
+        'overflow': max(pool.overflow(), 0),
+        'checkouts': pool.checkouts,
+        'wait_seconds_total': round(pool.wait_seconds_total, 3),
+        'wait_seconds_max': round(pool.wait_seconds_max, 3),
+    }
+
+
+def sqlalchemy_pools() -> Dict[str, List[Dict]]:
+    """watchman check reporting the pool metrics of the shared engines in the process serving status/"""
+    return {'sqlalchemy_pools': [
+        {name: {'ok': True, **pool_metrics(engine)}} for name, engine in sorted(shared_engines.items())
+    ]}
+
+
+def pool_metrics_status() -> str:
+    """Reports the pool metrics of the process's shared engines, for the cron status"""
+    status = ""
+    for name, engine in sorted(shared_engines.items()):
+        metrics = pool_metrics(engine)
+        status += (f"Connection pool {name}: size {metrics['size']}, {metrics['checked_out']} checked out, "
+                   f"{metrics['overflow']} overflow, {metrics['checkouts']} checkouts, "
+                   f"{metrics['wait_seconds_total']}s waiting (longest {metrics['wait_seconds_max']}s)\n")
+    return status
+
+
 def canvas_id_to_incremented_id(canvas_id):
     try:
         int(canvas_id)
@@ -58,6 +124,21 @@ def incremented_id_to_canvas_id(incremented_id):
     return str(int(incremented_id) - settings.CANVAS_DATA_ID_INCREMENT)
 
 
+def fetch_all(sql: str, params: Union[Dict, List, None] = None) -> List[tuple]:
+    """Runs a query on Django's (persistent) connection and returns its rows as tuples"""
+    with django.db.connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def fetch_value(sql: str, params: Union[Dict, List, None] = None):
+    """Runs a query returning one value, e.g. a count(*), and returns it (or None when there are no rows)"""
+    with django.db.connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+    return row[0] if row is not None else None
+
+
 def get_course_name_from_id(course_id):
     """[Get the long course name from the id]
 
@@ -0,0 +1,18 @@
+# JSON serialization of API responses, with orjson instead of the standard library's json
+from typing import Any, Callable, Optional
+
+import orjson
+from django.http import HttpResponse
+
+
+# Keys that are not strings (such as Canvas ids) are written as strings, and datetimes go through default, as with json
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def dumps(data: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serializes data the way json.dumps does, without the spaces after separators"""
+    return orjson.dumps(data, default=default, option=JSON_OPTIONS)
+
+
+def json_response(data: Any, default: Optional[Callable[[Any], Any]] = None, **kwargs) -> HttpResponse:
+    return HttpResponse(dumps(data, default), content_type='application/json', **kwargs)
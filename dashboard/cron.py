@@ -1,41 +1,153 @@
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 import logging
-from collections import namedtuple
-from typing import Any, Dict, List, Optional, Union
+import resource
+import time
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from zoneinfo import ZoneInfo
 from functools import wraps
 
+import hashlib
+import json
+
 import hjson
+import numpy as np
 import pandas as pd
-import pangres
+import pyarrow as pa
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import connections as conns, models
 from django.db.models import QuerySet
 from django_cron import CronJobBase, Schedule
 from google.cloud import bigquery
-from sqlalchemy import types, text
+from sqlalchemy import bindparam, text
 from sqlalchemy.engine import ResultProxy
 from sqlalchemy.orm import sessionmaker
 from constance import config
 
 from dashboard.common import db_util
-from dashboard.models import Course, Resource, AcademicTerms, User
+from dashboard.common.bulk_load import append_dataframe
+from dashboard.models import Course, CronCheckpoint, CronStageMetrics, Resource, AcademicTerms, UnizinMetadata, User
 
 
 logger = logging.getLogger(__name__)
 
-# Decorator to clean up function call logging
+# Student (user_id, course_id) pairs and a lowercased login name -> user_id map, loaded once per run
+EnrollmentIndex = namedtuple("EnrollmentIndex", ["students", "user_ids_by_login"])
+ResourceSyncCounts = namedtuple("ResourceSyncCounts", ["inserted", "updated", "skipped"])
+# A resource table row, cached per run so resource_access rows can reference resource.id without a lookup query
+KnownResource = namedtuple("KnownResource", ["id", "resource_type", "name"])
+# Estimated (dry run) and billed bytes of each BigQuery query in a run, reported in the cron status
+BigQueryStats = namedtuple("BigQueryStats", ["label", "estimated_bytes", "billed_bytes", "cached"])
+
+UPSERT_RESOURCE_SQL = (
+    "INSERT INTO resource (resource_id, resource_type, name) VALUES (:resource_id, :resource_type, :name) "
+    "ON DUPLICATE KEY UPDATE resource_type = VALUES(resource_type), name = VALUES(name)"
+)
+
+# Keep warehouse INT64 columns as nullable Int64 so ids above 2**53 never pass through float64
+ARROW_TYPES_MAPPER = {pa.int64(): pd.Int64Dtype()}.get
+
+# Columns update_resource_access uses from the event queries, with compact dtypes
+# (None keeps the dtype Arrow converts to, e.g. datetime64 for DATETIME columns)
+RESOURCE_ACCESS_DTYPES = {
+    'resource_type': 'category',
+    'resource_id': None,
+    'user_id': 'Int64',
+    'user_login_name': None,
+    'course_id': 'Int64',
+    'name': 'category',
+    'access_time': None,
+}
+
+
+class BigQueryBudgetExceeded(Exception):
+    pass
+
+
+def resource_key(resource_id: str) -> str:
+    """
+    Key of a resource id in known_resources. resource.resource_id has a case-insensitive PAD SPACE collation,
+    so ids differing only in case or trailing spaces are the same row.
+    """
+    return resource_id.rstrip(' ').lower()
+
+
+def resource_access_hashes(resource_access_df: pd.DataFrame) -> np.ndarray:
+    """
+    Returns a 64-bit hash of each event's (resource_id, user_id, access_time), normalizing the dtypes first so
+    the same event hashes the same whichever source or run it came from.
+    """
+    access_time = resource_access_df['access_time']
+    if isinstance(access_time.dtype, pd.DatetimeTZDtype):
+        access_time = access_time.dt.tz_convert('UTC').dt.tz_localize(None)
+    key_df = pd.DataFrame({
+        'resource_id': resource_access_df['resource_id'].astype(str),
+        'user_id': resource_access_df['user_id'].astype('int64'),
+        'access_time': access_time.astype('datetime64[ns]'),
+    })
+    return pd.util.hash_pandas_object(key_df, index=False).to_numpy()
+
+
+class SeenAccessHashes:
+    """
+    Hashes of the resource access events already kept in a run, in sorted arrays of decreasing size. Each chunk
+    adds an array, merged with the ones before it while they are no larger, so a hash is copied O(log n) times
+    in a run instead of once per chunk, and there are O(log n) arrays to search.
+    """
+
+    def __init__(self) -> None:
+        self.sorted_arrays: List[np.ndarray] = []
+
+    def seen(self, hashes: np.ndarray) -> np.ndarray:
+        # searchsorted is several times faster with sorted keys, which walk the arrays in order
+        order = np.argsort(hashes)
+        sorted_hashes = hashes[order]
+        sorted_seen_mask = np.zeros(len(hashes), dtype=bool)
+        for sorted_array in self.sorted_arrays:
+            positions = np.searchsorted(sorted_array, sorted_hashes).clip(max=len(sorted_array) - 1)
+            sorted_seen_mask |= sorted_array[positions] == sorted_hashes
+        seen_mask = np.empty(len(hashes), dtype=bool)
+        seen_mask[order] = sorted_seen_mask
+        return seen_mask
+
+    def keep_new(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Returns a mask of the hashes seen for the first time, in this array or earlier ones, and remembers them
+        """
+        new_mask = ~pd.Series(hashes).duplicated().to_numpy() & ~self.seen(hashes)
+        new_hashes = np.sort(hashes[new_mask])
+        while self.sorted_arrays and len(self.sorted_arrays[-1]) <= len(new_hashes):
+            # The stable sort (Timsort) merges the two sorted runs in linear time; they never share a hash
+            new_hashes = np.sort(np.concatenate([self.sorted_arrays.pop(), new_hashes]), kind='stable')
+        if len(new_hashes):
+            self.sorted_arrays.append(new_hashes)
+        return new_mask
+
+
+def is_same_warehouse_date(stored_date: str, warehouse_date: str) -> bool:
+    # The stored value went through a MySQL VARCHAR column, so compare parsed dates when possible
+    try:
+        return pd.Timestamp(stored_date) == pd.Timestamp(warehouse_date)
+    except (ValueError, TypeError):
+        return stored_date == warehouse_date
+
+
+# Decorator to clean up function call logging and record the metrics of each cron stage
 def log_function_call(func):
     @wraps(func)
-    def wrapper(*args, **kwargs):
+    def wrapper(self, *args, **kwargs):
         logging.info(f"Calling function: {func.__name__}")
-        result = func(*args, **kwargs)
+        with self.stage_metrics(func.__name__):
+            result = func(self, *args, **kwargs)
         logging.info(f"Function {func.__name__} completed")
         return result
     return wrapper
 
+
 # cron job to populate course and user tables
 class DashboardCronJob(CronJobBase):
 
@@ -58,26 +170,137 @@ def setup_bigquery(self):
 
         # BQ Total Bytes Billed to report to status
         self.total_bytes_billed = 0
+        self.bq_query_stats: List[BigQueryStats] = []
+        # canvasdatadate of the warehouse snapshot, set by load_warehouse_metadata
+        self.warehouse_data_date: Optional[str] = None
 
     def __init__(self) -> None:
         """Constructor to be used to declare valid_locked_course_ids instance variable."""
         super().__init__()
-        self.myla_engine = db_util.create_sqlalchemy_engine(settings.DATABASES['default'])
+        # LOAD DATA LOCAL INFILE has to be allowed by the client connection as well as the server,
+        # so bulk loading uses its own engine rather than enabling it for the views' connections
+        if settings.CRON_BULK_LOAD:
+            self.myla_engine = db_util.get_shared_engine('bulk_load', connect_args={'local_infile': 1})
+        else:
+            self.myla_engine = db_util.get_shared_engine()
         self.setup_bigquery()
         self.setup_queries()
         self.valid_locked_course_ids: List[str]
+        self.rows_read = 0
+        self.rows_written = 0
+        self.run_start = datetime.now(ZoneInfo('UTC'))
+        # Checkpoints left by an interrupted run, keyed by (stage, chunk)
+        self.checkpoints: Dict[Tuple[str, str], CronCheckpoint] = {}
+        # Courses whose resource access was loaded by an interrupted run, with that run's start
+        self.resumed_course_run_starts: Dict[str, datetime] = {}
+
+    # Append a DataFrame to a MyLA table, bulk loading it when CRON_BULK_LOAD is enabled
+    def append_to_table(self, df: pd.DataFrame, mysql_table: str, ignore_duplicates: bool = False) -> int:
+        rows = append_dataframe(self.myla_engine, df, mysql_table, settings.CRON_BULK_LOAD, ignore_duplicates)
+        self.rows_written += rows
+        return rows
+
+    @contextmanager
+    def stage_metrics(self, stage: str):
+        """
+        Records the wall time, rows read and written, BigQuery bytes billed and peak RSS growth of a stage
+        in the cron_stage_metrics table, whether or not the stage succeeds.
+        """
+        rows_read_before, rows_written_before = self.rows_read, self.rows_written
+        bytes_billed_before = self.total_bytes_billed
+        # ru_maxrss is the process's peak RSS so far, in kilobytes on Linux
+        peak_rss_kb_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        finally:
+            metrics = CronStageMetrics(
+                run_start=self.run_start, stage=stage, succeeded=succeeded,
+                wall_seconds=time.perf_counter() - start,
+                rows_read=self.rows_read - rows_read_before,
+                rows_written=self.rows_written - rows_written_before,
+                bytes_billed=self.total_bytes_billed - bytes_billed_before,
+                peak_rss_growth_bytes=(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - peak_rss_kb_before) * 1024)
+            logger.info(f'{stage}: {metrics.wall_seconds:.1f}s, {metrics.rows_read} rows read, '
+                        f'{metrics.rows_written} rows written, {metrics.bytes_billed} bytes billed, '
+                        f'peak RSS grew {metrics.peak_rss_growth_bytes} bytes')
+            try:
+                metrics.save()
+            except Exception:
+                # Metrics are not worth failing (or hiding the error of) a stage for
+                logger.exception(f'Could not save metrics for stage {stage}')
 
-    # Split a list into *size* shorter pieces
-    def split_list(self, a_list: list, size: int = 20):
-        return [a_list[i:i + size] for i in range(0, len(a_list), size)]
+    def load_checkpoints(self, prune: bool = True) -> None:
+        """
+        Keeps the checkpoints of an interrupted run that loaded the same warehouse snapshot, so their stages and
+        chunks are not loaded again, and with prune, removes any others. Only the run coordinating the stages prunes;
+        a shard worker must not delete the checkpoints the coordinator and other shards are writing.
+        """
+        if prune:
+            stale_checkpoints = CronCheckpoint.objects.all() if self.warehouse_data_date is None \
+                else CronCheckpoint.objects.exclude(warehouse_data_date=self.warehouse_data_date)
+            stale_checkpoints.delete()
+        self.checkpoints = {(checkpoint.stage, checkpoint.chunk): checkpoint for checkpoint in CronCheckpoint.objects.all()}
+        if self.checkpoints:
+            logger.info(f'Resuming from {len(self.checkpoints)} checkpoints of an interrupted run')
+
+    def save_checkpoint(self, stage: str, chunk: str = '', watermark: Optional[datetime] = None, rows: int = 0) -> None:
+        CronCheckpoint.objects.create(
+            run_start=self.run_start, stage=stage, chunk=chunk, watermark=watermark, rows=rows,
+            warehouse_data_date=self.warehouse_data_date)
+
+    def run_stage(self, stage_function: Callable[[], str]) -> str:
+        """
+        Runs a full-reload stage unless an interrupted run already completed it from the same warehouse snapshot.
+        """
+        stage = stage_function.__name__
+        chunk = self.course_set_key(self.valid_locked_course_ids)
+        checkpoint = self.checkpoints.get((stage, chunk))
+        if checkpoint is not None:
+            logger.info(f'Skipping {stage}, completed by the interrupted run started at {checkpoint.run_start}')
+            return f"{stage} skipped; {checkpoint.rows} rows were loaded by the run started at {checkpoint.run_start}\n"
+
+        rows_before = self.rows_written
+        status = stage_function()
+        self.save_checkpoint(stage, chunk, rows=self.rows_written - rows_before)
+        return status
+
+    # Identifies the courses a full-reload stage loaded, so the stage runs again if courses were added since
+    @staticmethod
+    def course_set_key(course_ids: List[str]) -> str:
+        return hashlib.sha256(','.join(sorted(course_ids)).encode('utf-8')).hexdigest()
 
+    # Identifies a resource_access chunk, which stays the same until its courses' data_last_updated changes.
+    # Takes the stored watermarks, before clamping to MAX_ALLOWED_UPDATE_DATE, which moves with every run.
+    @staticmethod
+    def resource_access_chunk_key(watermarks: Dict[str, datetime]) -> str:
+        chunk_source = ','.join(f'{course_id}@{watermarks[course_id].isoformat()}' for course_id in sorted(watermarks))
+        return hashlib.sha256(chunk_source.encode('utf-8')).hexdigest()
+
+    def bucket_courses_by_watermark(self, watermarks: Dict[str, datetime]) -> List[Tuple[datetime, List[str]]]:
+        """
+        Groups courses whose watermarks are within CRON_WATERMARK_BUCKET_HOURS of each other, at most CRON_BQ_IN_LIMIT
+        courses per group, so each group can be loaded with one query starting from its earliest watermark.
+
+        :return: List of (earliest watermark, course ids) tuples
+        """
+        bucket_window = timedelta(hours=settings.CRON_WATERMARK_BUCKET_HOURS)
+        buckets: List[Tuple[datetime, List[str]]] = []
+        for course_id, watermark in sorted(watermarks.items(), key=lambda item: item[1]):
+            if (not buckets or len(buckets[-1][1]) >= settings.CRON_BQ_IN_LIMIT
+                    or watermark - buckets[-1][0] > bucket_window):
+                buckets.append((watermark, []))
+            buckets[-1][1].append(course_id)
+        return buckets
 
     # This util_function is used to run a query against the context store and insert the result into a MySQL table
     def util_function(self, sql_string, mysql_table, bq_job_config:Optional[bigquery.QueryJobConfig]=None, table_identifier=None):
         logger.debug(f'sql={sql_string}')
         logger.debug(f'table={mysql_table} params={bq_job_config} table_identifier={table_identifier}')
 
-        df = self.execute_bq_query(sql_string, bq_job_config).to_dataframe()
+        df = self.bq_result_to_dataframe(self.execute_bq_query(sql_string, bq_job_config, mysql_table))
 
         # drop duplicates
         df = df.drop_duplicates(keep='first')
@@ -86,29 +309,79 @@ def util_function(self, sql_string, mysql_table, bq_job_config:Optional[bigquery
 
         # write to MySQL
         try:
-            df.to_sql(con=self.myla_engine, name=mysql_table, if_exists='append', index=False)
+            self.append_to_table(df, mysql_table)
         except Exception as e:
-            logger.exception(f"Error running to_sql on table {mysql_table}")
+            logger.exception(f"Error writing to table {mysql_table}")
             raise
 
         # returns the row size of dataframe
         return f"{str(df.shape[0])} {mysql_table}\n"
 
+    def bq_result_to_dataframe(self, bq_result, dtypes: Optional[Dict[str, Optional[str]]] = None) -> pd.DataFrame:
+        """
+        Converts a BigQuery result to a DataFrame through Arrow. When dtypes is given, only those columns
+        (of the ones the query returned) are converted, with those dtypes.
+        """
+        arrow_table = bq_result.to_arrow()
+        self.rows_read += arrow_table.num_rows
+        if not dtypes:
+            return arrow_table.to_pandas(types_mapper=ARROW_TYPES_MAPPER)
+
+        columns = [column for column in dtypes if column in arrow_table.column_names]
+        arrow_table = arrow_table.select(columns)
+        # Dictionary-encoded columns convert straight to categoricals, without a Python string object per row
+        for column in columns:
+            if dtypes[column] == 'category':
+                arrow_table = arrow_table.set_column(
+                    arrow_table.column_names.index(column), column, arrow_table[column].dictionary_encode())
+        df = arrow_table.to_pandas(types_mapper=ARROW_TYPES_MAPPER)
+        # astype copies every column unless told otherwise, doubling the chunk's memory for a moment
+        return df.astype({
+            column: dtypes[column] for column in columns
+            if dtypes[column] not in (None, 'category', str(df[column].dtype))
+        }, copy=False)
+
+    def estimate_bq_query(self, query: str, bq_job_config: Optional[bigquery.QueryJobConfig], label: str,
+                          location: Optional[str] = None) -> int:
+        """
+        Dry-runs a query to get the bytes it would process, raising BigQueryBudgetExceeded if running it
+        could take the run over CRON_BQ_BYTES_BUDGET.
+        """
+        dry_run_config = bigquery.QueryJobConfig(
+            dry_run=True, use_query_cache=False,
+            query_parameters=bq_job_config.query_parameters if bq_job_config else [])
+        estimated_bytes = self.bigquery_client.query(
+            query, job_config=dry_run_config, location=location).total_bytes_processed or 0
+        logger.debug(f"The {label} query is estimated to process {estimated_bytes} bytes")
+
+        budget = settings.CRON_BQ_BYTES_BUDGET
+        if budget is not None and self.total_bytes_billed + estimated_bytes > budget:
+            raise BigQueryBudgetExceeded(
+                f"The {label} query is estimated to process {estimated_bytes} bytes, which with the "
+                f"{self.total_bytes_billed} bytes billed so far exceeds the budget of {budget} bytes")
+        return estimated_bytes
+
+    def record_bq_job(self, query_job: bigquery.QueryJob, label: str, estimated_bytes: int) -> None:
+        billed_bytes = query_job.total_bytes_billed or 0
+        self.total_bytes_billed += billed_bytes
+        self.bq_query_stats.append(BigQueryStats(label, estimated_bytes, billed_bytes, False))
+        logger.debug(f"This job had {billed_bytes} bytes. Total: {self.total_bytes_billed}")
 
     # Execute a query against the bigquery database
 
-    def execute_bq_query(self, query: str, bq_job_config: Optional[bigquery.QueryJobConfig] = None):
+    def execute_bq_query(self, query: str, bq_job_config: Optional[bigquery.QueryJobConfig] = None,
+                         label: str = 'query'):
         # Remove the newlines from the query
         query = query.replace("\n", " ")
 
+        estimated_bytes = self.estimate_bq_query(query, bq_job_config, label)
         if bq_job_config:
             try:
                 # Convert to bq schema object
                 query_job = self.bigquery_client.query(query, job_config=bq_job_config)
                 query_job_result = query_job.result()
 
-                self.total_bytes_billed += query_job.total_bytes_billed
-                logger.debug(f"This job had {query_job.total_bytes_billed} bytes. Total: {self.total_bytes_billed}")
+                self.record_bq_job(query_job, label, estimated_bytes)
                 return query_job_result
             except Exception as e:
                 logger.error(f"Error ({str(e)}) in setting up schema for query {query}.")
@@ -116,10 +389,33 @@ def execute_bq_query(self, query: str, bq_job_config: Optional[bigquery.QueryJob
         else:
             query_job = self.bigquery_client.query(query)
             query_job_result = query_job.result()
-            self.total_bytes_billed += query_job.total_bytes_billed
-            logger.debug(f"This job had {query_job.total_bytes_billed} bytes. Total: {self.total_bytes_billed}")
+            self.record_bq_job(query_job, label, estimated_bytes)
             return query_job_result
 
+    def cached_bq_query(self, query: str, bq_job_config: Optional[bigquery.QueryJobConfig] = None,
+                        label: str = 'query') -> pd.DataFrame:
+        """
+        Runs a query whose result only changes with the warehouse snapshot, reusing the result of an earlier run
+        with the same parameters while the warehouse canvasdatadate is unchanged.
+        """
+        if self.warehouse_data_date is None:
+            return self.bq_result_to_dataframe(self.execute_bq_query(query, bq_job_config, label))
+
+        query_parameters = [parameter.to_api_repr() for parameter in bq_job_config.query_parameters] \
+            if bq_job_config else []
+        cache_key_source = json.dumps([query, query_parameters, self.warehouse_data_date], sort_keys=True)
+        cache_key = f"cron_bq_{label}_{hashlib.sha256(cache_key_source.encode('utf-8')).hexdigest()}"
+
+        df = cache.get(cache_key)
+        if df is not None:
+            logger.info(f"Reusing the cached {label} query result for warehouse date {self.warehouse_data_date}")
+            self.bq_query_stats.append(BigQueryStats(label, 0, 0, True))
+            return df
+
+        df = self.bq_result_to_dataframe(self.execute_bq_query(query, bq_job_config, label))
+        cache.set(cache_key, df, settings.CRON_BQ_CACHE_TTL)
+        return df
+
     # Execute a query against the MyLA database
     def execute_myla_query(self, query: str, params: Optional[Dict] = None) -> ResultProxy:
         with self.myla_engine.begin() as connection:
@@ -129,6 +425,16 @@ def execute_myla_query(self, query: str, params: Optional[Dict] = None) -> Resul
             else:
                 return connection.execute(text(query))
 
+    # remove resource_access records of the given courses after their watermark, so they can be loaded again
+    def delete_resource_access_since(self, course_ids: List[str], data_last_updated: datetime) -> str:
+        delete_query = text(
+            "DELETE FROM resource_access WHERE course_id IN :course_ids AND access_time > :data_last_updated"
+        ).bindparams(bindparam('course_ids', expanding=True))
+        with self.myla_engine.begin() as connection:
+            result_proxy = connection.execute(
+                delete_query, {'course_ids': course_ids, 'data_last_updated': data_last_updated})
+        return f"\n{result_proxy.rowcount} resource_access rows deleted for {len(course_ids)} course(s) after {data_last_updated}\n"
+
     # remove all records inside the specified table
     def execute_myla_delete_query(self, query: str, params: Optional[Dict[str,str]] = None) -> str:
         # delete all records in the table first, can have an optional where clause
@@ -165,13 +471,13 @@ def verify_course_ids(self):
         supported_courses = Course.objects.get_supported_courses()
         course_ids = [str(x) for x in supported_courses.values_list('id', flat=True)]
 
-        courses_data = self.execute_bq_query(
+        courses_data = self.cached_bq_query(
             self.queries['course'],
             bigquery.QueryJobConfig(query_parameters=[
                 bigquery.ArrayQueryParameter('course_ids', 'STRING', course_ids),
-            ])
+            ]),
+            'course'
         )
-        courses_data = courses_data.to_dataframe()
         # error out when course id is invalid, otherwise add DataFrame to list
         for course_id, data_last_updated in supported_courses:
             if course_id not in list(courses_data['id']):
@@ -213,6 +519,38 @@ def update_user(self):
 
         return status
 
+    # read unizin metadata from the data warehouse, which identifies the snapshot the other queries will see
+    @log_function_call
+    def load_warehouse_metadata(self):
+        metadata_sql = self.queries['metadata']
+
+        logger.debug(metadata_sql)
+
+        self.warehouse_metadata_df = self.bq_result_to_dataframe(
+            self.execute_bq_query(metadata_sql, label='unizin_metadata'))
+        canvas_data_dates = self.warehouse_metadata_df.loc[
+            self.warehouse_metadata_df['pkey'] == 'canvasdatadate', 'pvalue']
+        self.warehouse_data_date = str(canvas_data_dates.iloc[0]) if len(canvas_data_dates) else None
+        logger.info(f'Warehouse canvasdatadate: {self.warehouse_data_date}')
+
+    def is_warehouse_unchanged(self) -> bool:
+        """
+        Whether the warehouse snapshot is the one stored by the last run and every course has already been loaded
+        from it, in which case the full-reload stages would write the same data again.
+        """
+        if not settings.CRON_SKIP_UNCHANGED_WAREHOUSE or self.warehouse_data_date is None:
+            return False
+
+        stored_data_date = UnizinMetadata.objects.filter(pkey='canvasdatadate').values_list('pvalue', flat=True).first()
+        if stored_data_date is None or not is_same_warehouse_date(stored_data_date, self.warehouse_data_date):
+            logger.info(f'Warehouse canvasdatadate changed from {stored_data_date} to {self.warehouse_data_date}')
+            return False
+
+        if Course.objects.filter(id__in=self.valid_locked_course_ids, data_last_updated__isnull=True).exists():
+            logger.info('Some courses have not been loaded from the current warehouse snapshot yet.')
+            return False
+        return True
+
     # update unizin metadata from data in the data warehouse
     @log_function_call
     def update_unizin_metadata(self):
@@ -223,12 +561,10 @@ def update_unizin_metadata(self):
         # delete all records in the table first
         status += self.execute_myla_delete_query("DELETE FROM unizin_metadata")
 
-        # select all student registered for the course
-        metadata_sql = self.queries['metadata']
-
-        logger.debug(metadata_sql)
-
-        status += self.util_function(metadata_sql, 'unizin_metadata')
+        # the metadata was read from the warehouse at the start of the run
+        df = self.warehouse_metadata_df.drop_duplicates(keep='first')
+        self.append_to_table(df, 'unizin_metadata')
+        status += f"{str(df.shape[0])} unizin_metadata\n"
 
         return status
 
@@ -240,12 +576,13 @@ def update_canvas_resource(self):
 
         # Select all the files for these courses
         # convert int array to str array
-        df_attach = self.execute_bq_query(
+        df_attach = self.bq_result_to_dataframe(self.execute_bq_query(
             self.queries['resource'],
             bigquery.QueryJobConfig(query_parameters=[
                 bigquery.ArrayQueryParameter('course_ids', 'STRING', self.valid_locked_course_ids,),
-            ])
-        ).to_dataframe()
+            ]),
+            'resource'
+        ))
 
         logger.debug(df_attach)
         # Update these back again based on the dataframe
@@ -259,6 +596,255 @@ def update_canvas_resource(self):
                 logger.debug(f"Row {row.id} removed as it is not available")
         return status
 
+    def load_enrollment_index(self) -> EnrollmentIndex:
+        """
+        Reads the user table once so each resource_access chunk can resolve login names and keep only
+        student events in memory, instead of querying the user table for every chunk.
+        """
+        student_df = pd.read_sql(
+            'select user_id, course_id from user where enrollment_type = %s and course_id is not null',
+            self.myla_engine, params=[(str(User.EnrollmentType.STUDENT),)])
+        students = pd.MultiIndex.from_frame(student_df.astype('int64'))
+
+        # MySQL compared login names case-insensitively, so keep doing that
+        login_df = pd.read_sql(
+            'select sis_name, user_id from user where sis_name is not null', self.myla_engine)
+        user_ids_by_login = pd.Series(
+            login_df['user_id'].values, index=login_df['sis_name'].str.lower(), dtype='Int64')
+        user_ids_by_login = user_ids_by_login[~user_ids_by_login.index.duplicated(keep='first')]
+
+        logger.info(f'Loaded {len(students)} student enrollments and {len(user_ids_by_login)} login names')
+        return EnrollmentIndex(students, user_ids_by_login)
+
+    def load_known_resources(self) -> Dict[str, KnownResource]:
+        """
+        Reads the resource table once so each resource_access chunk only has to write new or changed resources,
+        and can translate resource ids to resource.id without querying the table.
+
+        :return: Dictionary of resource_key(resource_id) -> KnownResource
+        """
+        resource_df = pd.read_sql('select id, resource_id, resource_type, name from resource', self.myla_engine)
+        known_resources = {
+            resource_key(resource_id): KnownResource(resource_pk, resource_type, name)
+            for resource_pk, resource_id, resource_type, name in resource_df.itertuples(index=False)
+        }
+        logger.info(f'Loaded {len(known_resources)} known resources')
+        return known_resources
+
+    def sync_resources(self, resource_df: pd.DataFrame, known_resources: Dict[str, KnownResource]) -> ResourceSyncCounts:
+        """
+        Upserts the resources in resource_df that are new or whose type or name changed, in one statement,
+        and records them in known_resources, reading back the ids of inserted resources.
+        """
+        # Rows to upsert by resource_key; of ids the database treats as one resource, the last one is written
+        changed_rows = {}
+        skipped = 0
+        for resource_id, resource_type, name in resource_df[['resource_id', 'resource_type', 'name']].itertuples(index=False):
+            resource_id = str(resource_id)
+            key = resource_key(resource_id)
+            known_resource = known_resources.get(key)
+            if known_resource is not None and (known_resource.resource_type, known_resource.name) == (resource_type, name):
+                skipped += 1
+                continue
+            changed_rows[key] = {'resource_id': resource_id, 'resource_type': resource_type, 'name': name}
+        inserted = sum(key not in known_resources for key in changed_rows)
+        updated = len(changed_rows) - inserted
+
+        if changed_rows:
+            inserted_resource_ids = [row['resource_id'] for key, row in changed_rows.items() if key not in known_resources]
+            with self.myla_engine.begin() as connection:
+                connection.execute(text(UPSERT_RESOURCE_SQL), list(changed_rows.values()))
+                # MySQL matches the ids by the column's collation and returns them as stored
+                inserted_resource_pks = {
+                    resource_key(resource_id): resource_pk for resource_id, resource_pk in connection.execute(
+                        text('select resource_id, id from resource where resource_id in :resource_ids')
+                        .bindparams(bindparam('resource_ids', expanding=True)),
+                        {'resource_ids': inserted_resource_ids}
+                    ).all()
+                } if inserted_resource_ids else {}
+            for key, row in changed_rows.items():
+                resource_pk = inserted_resource_pks[key] if key in inserted_resource_pks else known_resources[key].id
+                known_resources[key] = KnownResource(resource_pk, row['resource_type'], row['name'])
+
+        return ResourceSyncCounts(inserted, updated, skipped)
+
+    def fetch_resource_access(self, final_query: str, course_ids: List[str], course_ids_short: List[str],
+                              data_last_updated: datetime) -> Iterator[pd.DataFrame]:
+        """
+        Runs the resource access query for a group of courses, yielding the result in DataFrame chunks:
+        the whole result from BigQuery, or CRON_LRS_CHUNK_SIZE rows at a time from another LRS.
+        """
+        if settings.LRS_IS_BIGQUERY:
+            query_params = [
+                bigquery.ArrayQueryParameter('course_ids', 'STRING', course_ids),
+                bigquery.ArrayQueryParameter('course_ids_short', 'STRING', course_ids_short),
+                bigquery.ScalarQueryParameter('canvas_data_id_increment', 'INT64',
+                                              settings.CANVAS_DATA_ID_INCREMENT)
+            ]
+            if (data_last_updated is not None):
+                # insert the start time parameter for query
+                query_params.append(bigquery.ScalarQueryParameter(
+                    'data_last_updated', 'TIMESTAMP', data_last_updated))
+                query_params.append(bigquery.ArrayQueryParameter(
+                    'canvas_event_urls', 'STRING', settings.CANVAS_EVENT_URLS))
+            job_config = bigquery.QueryJobConfig()
+            job_config.query_parameters = query_params
+
+            # Location must match that of the dataset(s) referenced in the query.
+            estimated_bytes = self.estimate_bq_query(final_query, job_config, 'resource_access', location='US')
+            bq_job = self.bigquery_client.query(final_query, location='US', job_config=job_config)
+            # This is the call that could result in an exception
+            resource_access_df: pd.DataFrame = self.bq_result_to_dataframe(
+                bq_job.result(), RESOURCE_ACCESS_DTYPES)
+            self.record_bq_job(bq_job, 'resource_access', estimated_bytes)
+            yield resource_access_df
+        else:
+            query_params = {
+                'course_ids': course_ids,
+                'course_ids_short': course_ids_short,
+                'canvas_data_id_increment': settings.CANVAS_DATA_ID_INCREMENT,
+            }
+            if (data_last_updated is not None):
+                query_params['data_last_updated'] = data_last_updated
+
+            yield from self.stream_lrs_query(final_query, query_params)
+
+    def stream_lrs_query(self, query: str, params: Dict[str, Any]) -> Iterator[pd.DataFrame]:
+        """
+        Streams an LRS query through a server-side cursor (on PostgreSQL) so only one chunk of rows is held in memory
+        """
+        columns_dtypes = {column: dtype for column, dtype in RESOURCE_ACCESS_DTYPES.items() if dtype is not None}
+        with conns['LRS'].chunked_cursor() as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchmany(settings.CRON_LRS_CHUNK_SIZE)
+            # A named cursor (PostgreSQL) only has a description after its first fetch
+            columns = [column[0] for column in cursor.description]
+            while rows:
+                self.rows_read += len(rows)
+                # Building from object columns keeps ids with NULLs in the chunk from being converted to float64
+                chunk_df = pd.DataFrame(rows, columns=columns, dtype=object)
+                yield chunk_df.astype({column: dtype for column, dtype in columns_dtypes.items() if column in columns}) \
+                    .infer_objects()
+                rows = cursor.fetchmany(settings.CRON_LRS_CHUNK_SIZE)
+
+    def write_resource_access_chunk(
+        self, resource_access_df: pd.DataFrame, enrollment_index: EnrollmentIndex, known_resources: Dict[str, KnownResource],
+        seen_access_hashes: SeenAccessHashes
+    ) -> Tuple[int, ResourceSyncCounts]:
+        """
+        Resolves user ids, de-duplicates and filters a chunk of resource access events to students,
+        then writes its resources and events.
+
+        :return: Number of resource_access rows written and the resource table counts
+        """
+        resource_access_row_count = len(resource_access_df)
+        if resource_access_row_count == 0:
+            logger.info('No resource access data found.  Continuing...')
+            return 0, ResourceSyncCounts(0, 0, 0)
+
+        logger.debug('resource_access_df row count: '
+                     f'({resource_access_row_count}), memory usage: '
+                     f'{resource_access_df.memory_usage(deep=True).sum()} bytes')
+
+        logger.debug(f'resource_access_df:\n'
+                     f'{resource_access_df}\n'
+                     f'{resource_access_df.dtypes}')
+
+        if 'user_login_name' not in resource_access_df.columns:
+            logger.warning('Update queries in configuration file '
+                           'to include column "user_login_name".')
+        else:
+            # process data which contains user login names, but not IDs
+            if -1 in resource_access_df['user_id'].values:
+                missing_user_id = resource_access_df['user_id'] == -1
+
+                # replace real user_id values for missing ones (-1);
+                # logins with no matching user become NA and are dropped
+                resource_access_df['user_id'] = resource_access_df['user_id'].astype('Int64')
+                resource_access_df.loc[missing_user_id, 'user_id'] = (
+                    resource_access_df.loc[missing_user_id, 'user_login_name']
+                    .str.lower()
+                    .map(enrollment_index.user_ids_by_login)
+                )
+
+                resource_access_df = resource_access_df \
+                    .drop(columns=['user_login_name']) \
+                    .dropna()
+                resource_access_df['user_id'] = resource_access_df['user_id'].astype('int64')
+                logger.debug(f'resource_access_df:\n'
+                             f'{resource_access_df}\n'
+                             f'{resource_access_df.dtypes}')
+            else:
+                resource_access_df = resource_access_df.drop(
+                    columns='user_login_name')
+
+        resource_access_df = resource_access_df.dropna()
+
+        # drop duplicates, within this chunk and of events already kept from earlier chunks in this run
+        access_hashes = resource_access_hashes(resource_access_df)
+        new_access = seen_access_hashes.keep_new(access_hashes)
+        resource_access_df = resource_access_df[new_access].assign(access_hash=access_hashes[new_access])
+
+        logger.debug('resource_access_df row count (de-duped): '
+                     f'({len(resource_access_df)})')
+
+        logger.debug(f'resource_access_df:\n'
+                     f'{resource_access_df}\n'
+                     f'{resource_access_df.dtypes}')
+
+        # Make resource data from resource_access data
+        resource_df = resource_access_df.filter(["resource_id", "resource_type", "name"])
+        resource_df = resource_df.drop_duplicates(["resource_id"])
+
+        logger.debug(f'resource_df:\n'
+                     f'{resource_df}\n'
+                     f'{resource_df.dtypes}')
+
+        resource_access_df = resource_access_df.drop(
+            columns=['resource_type', 'name'])
+
+        ra_len_before = len(resource_access_df)
+
+        # Drop rows with NA in any column
+        resource_access_df = resource_access_df.dropna()
+
+        logger.info(f'{ra_len_before - len(resource_access_df)} / '
+                    f'{ra_len_before} resource_access_df rows with '
+                    'NA values dropped')
+
+        logger.debug(f'resource_access_df:\n'
+                     f'{resource_access_df}\n'
+                     f'{resource_access_df.dtypes}')
+        # only keep access events generated by students
+        access_enrollments = pd.MultiIndex.from_frame(
+            resource_access_df[['user_id', 'course_id']].astype('int64'))
+        resource_access_df = resource_access_df[access_enrollments.isin(enrollment_index.students)]
+        # First, update resource table
+        try:
+            chunk_resource_counts = self.sync_resources(resource_df, known_resources)
+        except Exception as e:
+            logger.exception('Error running upsert on table resource')
+            raise
+        logger.info(f'resource rows: {chunk_resource_counts.inserted} inserted, '
+                    f'{chunk_resource_counts.updated} updated, {chunk_resource_counts.skipped} unchanged')
+
+        # resource_access references resource.id; every resource id in the chunk is known after the sync
+        resource_pks = {
+            resource_id: known_resources[resource_key(resource_id)].id for resource_id in resource_df['resource_id'].astype(str)
+        }
+        resource_access_df = resource_access_df.assign(
+            resource_id=resource_access_df['resource_id'].astype(str).map(resource_pks).astype('int64'))
+
+        # Next, update resource_access table
+        try:
+            # the unique access_hash makes replaying a load (e.g. after a failed run) skip events already written
+            self.append_to_table(resource_access_df, 'resource_access', ignore_duplicates=True)
+        except Exception as e:
+            logger.exception('Error writing to table resource_access')
+            raise
+
+        return len(resource_access_df), chunk_resource_counts
+
     # update RESOURCE_ACCESS records from BigQuery or LRS data sources
     @log_function_call
     def update_resource_access(self):
@@ -268,24 +854,44 @@ def update_resource_access(self):
         # return string with concatenated SQL insert result
         return_string = ""
 
-        data_last_updated = Course.objects.filter(id__in=self.valid_locked_course_ids).get_data_earliest_date()
+        enrollment_index = self.load_enrollment_index()
+        known_resources = self.load_known_resources()
+        resource_counts = ResourceSyncCounts(0, 0, 0)
+        seen_access_hashes = SeenAccessHashes()
+
+        watermarks = Course.objects.filter(id__in=self.valid_locked_course_ids).get_data_watermarks()
 
         # Maximum number of days allowed for updating course access data
         MAX_ALLOWED_UPDATE_DATE = datetime.now(ZoneInfo(settings.TIME_ZONE)) - timedelta(days=config.MAX_ALLOWED_UPDATE_DAYS)
-        # Overriding the original timestamp
-        if data_last_updated < MAX_ALLOWED_UPDATE_DATE:
-            logger.info(
-                f"Overriding data_last_updated from {data_last_updated.isoformat()} "
-                f"to MAX_ALLOWED_UPDATE_DATE {MAX_ALLOWED_UPDATE_DATE.isoformat()} "
-                f"due to max allowed update days limit of {config.MAX_ALLOWED_UPDATE_DAYS}."
-            )
-            data_last_updated = MAX_ALLOWED_UPDATE_DATE
+        course_watermarks: Dict[str, datetime] = {}
+        stored_watermarks: Dict[str, datetime] = {}
+        for course_id, watermark in watermarks.items():
+            stored_watermarks[str(course_id)] = watermark
+            # Overriding the original timestamp
+            if watermark < MAX_ALLOWED_UPDATE_DATE:
+                logger.info(
+                    f"Overriding data_last_updated for course {course_id} from {watermark.isoformat()} "
+                    f"to MAX_ALLOWED_UPDATE_DATE {MAX_ALLOWED_UPDATE_DATE.isoformat()} "
+                    f"due to max allowed update days limit of {config.MAX_ALLOWED_UPDATE_DAYS}."
+                )
+                watermark = MAX_ALLOWED_UPDATE_DATE
+            course_watermarks[str(course_id)] = watermark
+
+        # loop through groups of courses with similar watermarks, at most CRON_BQ_IN_LIMIT at a time,
+        # each loaded from the earliest watermark in the group
+        for data_last_updated, data_warehouse_course_ids in self.bucket_courses_by_watermark(course_watermarks):
+            chunk = self.resource_access_chunk_key(
+                {course_id: stored_watermarks[course_id] for course_id in data_warehouse_course_ids})
+            checkpoint = self.checkpoints.get(('update_resource_access', chunk))
+            if checkpoint is not None:
+                logger.info(f'Skipping {len(data_warehouse_course_ids)} course(s) loaded by the interrupted run '
+                            f'started at {checkpoint.run_start}')
+                for course_id in data_warehouse_course_ids:
+                    self.resumed_course_run_starts[course_id] = checkpoint.run_start
+                continue
 
-        status += self.execute_myla_delete_query("DELETE FROM resource_access WHERE access_time > :data_last_updated", {'data_last_updated': data_last_updated })
+            status += self.delete_resource_access_since(data_warehouse_course_ids, data_last_updated)
 
-        # loop through multiple course ids, 20 at a time
-        # (This is set by the CRON_BQ_IN_LIMIT from settings)
-        for data_warehouse_course_ids in self.split_list(self.valid_locked_course_ids, settings.CRON_BQ_IN_LIMIT):
             # query to retrieve all file access events for one course
             # There is no catch if this query fails, event_store.events needs to exist
             final_query = []
@@ -309,172 +915,23 @@ def update_resource_access(self):
             logger.debug(final_query)
             logger.debug(data_warehouse_course_ids)
 
-            if settings.LRS_IS_BIGQUERY:
-                query_params = [
-                    bigquery.ArrayQueryParameter('course_ids', 'STRING', data_warehouse_course_ids),
-                    bigquery.ArrayQueryParameter('course_ids_short', 'STRING', course_ids_short),
-                    bigquery.ScalarQueryParameter('canvas_data_id_increment', 'INT64',
-                                                  settings.CANVAS_DATA_ID_INCREMENT)
-                ]
-                if (data_last_updated is not None):
-                    # insert the start time parameter for query
-                    query_params.append(bigquery.ScalarQueryParameter(
-                        'data_last_updated', 'TIMESTAMP', data_last_updated))
-                    query_params.append(bigquery.ArrayQueryParameter(
-                        'canvas_event_urls', 'STRING', settings.CANVAS_EVENT_URLS))
-                job_config = bigquery.QueryJobConfig()
-                job_config.query_parameters = query_params
-
-                # Location must match that of the dataset(s) referenced in the query.
-                bq_job = self.bigquery_client.query(final_query, location='US', job_config=job_config)
-                # This is the call that could result in an exception
-                resource_access_df: pd.DataFrame = bq_job.to_dataframe()
-                self.total_bytes_billed += bq_job.total_bytes_billed
-                logger.debug(self.total_bytes_billed)
-            else:
-                query_params = {
-                    'course_ids': data_warehouse_course_ids,
-                    'course_ids_short': course_ids_short,
-                    'canvas_data_id_increment': settings.CANVAS_DATA_ID_INCREMENT,
-                }
-                if (data_last_updated is not None):
-                    query_params['data_last_updated'] = data_last_updated
-
-                resource_access_df = pd.read_sql(final_query, conns['LRS'], params=query_params)
-
-            resource_access_row_count = len(resource_access_df)
-            if resource_access_row_count == 0:
-                logger.info('No resource access data found.  Continuing...')
-                continue
-
-            logger.debug('resource_access_df row count: '
-                         f'({resource_access_row_count})')
-
-            logger.debug(f'resource_access_df:\n'
-                         f'{resource_access_df}\n'
-                         f'{resource_access_df.dtypes}')
-
-            if 'user_login_name' not in resource_access_df.columns:
-                logger.warning('Update queries in configuration file '
-                               'to include column "user_login_name".')
-            else:
-                # process data which contains user login names, but not IDs
-                if -1 in resource_access_df['user_id'].values:
-                    login_names = ','.join(
-                        map(repr, resource_access_df['user_login_name']
-                            .drop_duplicates().dropna().values))
-
-                    logger.debug(f'login_names:\n{login_names}')
-
-                    # get user ID as string because pd.merge will convert
-                    # int64 to scientific notation; converting SN to int64
-                    # causes Obi-Wan problems (off by one)
-                    user_id_df = pd.read_sql(
-                        'select sis_name as user_login_name,'
-                        'cast(user_id as char) as user_id_str '
-                        f'from user where sis_name in ({login_names})',
-                        self.myla_engine)
-
-                    logger.debug(f'user_id_df:\n'
-                                 f'{user_id_df}\n'
-                                 f'{user_id_df.dtypes}')
-
-                    # combine user login and ID data
-                    resource_access_df = pd.merge(
-                        resource_access_df, user_id_df,
-                        on='user_login_name', how='outer')
-
-                    # replace real user_id values for missing ones (-1)
-                    resource_access_df.loc[
-                        resource_access_df['user_id'] == -1,
-                        'user_id'] = resource_access_df['user_id_str']
-
-                    # drops must be in this order; especially dropna() LAST
-                    resource_access_df = resource_access_df \
-                        .drop(columns=['user_id_str', 'user_login_name']) \
-                        .dropna()
-                    resource_access_df['user_id'] = pd.to_numeric(resource_access_df['user_id'])
-                    logger.debug(f'resource_access_df:\n'
-                                 f'{resource_access_df}\n'
-                                 f'{resource_access_df.dtypes}')
-                else:
-                    resource_access_df = resource_access_df.drop(
-                        columns='user_login_name')
-
-            resource_access_df = resource_access_df.dropna()
-
-            # drop duplicates
-            resource_access_df = resource_access_df.drop_duplicates(
-                ['resource_id', 'user_id', 'access_time'], keep='first')
-
-            logger.debug('resource_access_df row count (de-duped): '
-                         f'({len(resource_access_df)})')
-
-            logger.debug(f'resource_access_df:\n'
-                         f'{resource_access_df}\n'
-                         f'{resource_access_df.dtypes}')
-
-            # Make resource data from resource_access data
-            resource_df = resource_access_df.filter(["resource_id", "resource_type", "name"])
-            resource_df = resource_df.drop_duplicates(["resource_id"])
-            # pangres.upsert() requires DataFrame to have index
-            resource_df = resource_df.set_index('resource_id')
-
-            logger.debug(f'resource_df:\n'
-                         f'{resource_df}\n'
-                         f'{resource_df.dtypes}')
-
-            resource_access_df = resource_access_df.drop(
-                columns=['resource_type', 'name'])
-
-            ra_len_before = len(resource_access_df)
-
-            # Drop rows with NA in any column
-            resource_access_df = resource_access_df.dropna()
-
-            logger.info(f'{ra_len_before - len(resource_access_df)} / '
-                        f'{ra_len_before} resource_access_df rows with '
-                        'NA values dropped')
-
-            logger.debug(f'resource_access_df:\n'
-                         f'{resource_access_df}\n'
-                         f'{resource_access_df.dtypes}')
-            # only keep access events generated by students
-            student_enrollment_type = User.EnrollmentType.STUDENT
-            student_enrollment_df = pd.read_sql(
-                'select user_id, course_id from user where enrollment_type= %s',
-                self.myla_engine, params=[(str(student_enrollment_type),)])
-            resource_access_df = pd.merge(
-                resource_access_df, student_enrollment_df,
-                on=['user_id', 'course_id'],
-                # use inner merge to keep only resource access event (left)
-                # innitiated by people with student enrollment type (right)
-                how='inner')
-            # First, update resource table
-            try:
-                dtype = {'resource_id': types.VARCHAR(255)}
-                pangres.upsert(con=self.myla_engine, df=resource_df,
-                               table_name='resource', if_row_exists='update',
-                               create_schema=False, add_new_columns=False,
-                               dtype=dtype)
-            except Exception as e:
-                logger.exception('Error running upsert on table resource')
-                raise
-
-            # Next, update resource_access table
-            try:
-                resource_access_df.to_sql(con=self.myla_engine, name='resource_access',
-                                          if_exists='append', index=False)
-            except Exception as e:
-                logger.exception('Error running to_sql on table '
-                                 'resource_access')
-                raise
+            rows_written = 0
+            for resource_access_df in self.fetch_resource_access(
+                    final_query, data_warehouse_course_ids, course_ids_short, data_last_updated):
+                chunk_rows_written, chunk_resource_counts = self.write_resource_access_chunk(
+                    resource_access_df, enrollment_index, known_resources, seen_access_hashes)
+                rows_written += chunk_rows_written
+                resource_counts = ResourceSyncCounts(
+                    *(total + count for total, count in zip(resource_counts, chunk_resource_counts)))
+            self.save_checkpoint('update_resource_access', chunk, data_last_updated, rows_written)
 
             return_string += \
-                f'{len(resource_access_df)} rows for courses [' + ', '.join(
+                f'{rows_written} rows for courses [' + ', '.join(
                     map(repr, data_warehouse_course_ids)) + ']\n'
             logger.info(return_string)
 
+        status += (f'{resource_counts.inserted} resources inserted, {resource_counts.updated} updated, '
+                   f'{resource_counts.skipped} unchanged\n')
         return status
 
     @log_function_call
@@ -535,9 +992,9 @@ def submission(self):
             bigquery.ScalarQueryParameter('canvas_data_id_increment', 'INT64', settings.CANVAS_DATA_ID_INCREMENT),
         ])
 
-        df = self.execute_bq_query(self.queries['submission'], bq_job_config).to_dataframe()
+        df = self.bq_result_to_dataframe(self.execute_bq_query(self.queries['submission'], bq_job_config, 'submission'))
         df = df.drop_duplicates(keep='first')
-        df.to_sql(con=self.myla_engine, name='submission', if_exists='append', index=False)
+        self.append_to_table(df, 'submission')
 
         status+=f"{str(df.shape[0])} submission\n"
 
@@ -575,7 +1032,7 @@ def update_term(self) -> str:
 
         term_sql: str = self.queries['term']
         logger.debug(term_sql)
-        warehouse_term_df: pd.DataFrame = self.execute_bq_query(term_sql).to_dataframe()
+        warehouse_term_df: pd.DataFrame = self.cached_bq_query(term_sql, label='term')
 
         existing_terms_ids: List[int] = [term.id for term in list(AcademicTerms.objects.all())]
         new_term_ids: List[int] = [int(id) for id in warehouse_term_df['id'].to_list() if id not in existing_terms_ids]
@@ -639,13 +1096,30 @@ def update_course(self, warehouse_courses_data: pd.DataFrame) -> str:
                 status += f'Course {course.id}: updated {", ".join(updated_fields)}\n'
         return status
 
+    # Loads resource access for all valid courses in this process; overridden by the sharded cron
+    def load_resource_access(self) -> str:
+        return self.update_resource_access()
+
+    def bq_query_stats_status(self) -> str:
+        status = ""
+        for query_stats in self.bq_query_stats:
+            if query_stats.cached:
+                status += f'BQ {query_stats.label}: reused cached result\n'
+            else:
+                status += (f'BQ {query_stats.label}: {query_stats.estimated_bytes} bytes estimated, '
+                           f'{query_stats.billed_bytes} bytes billed\n')
+        return status
+
     def do(self) -> str:
         logger.info("** MyLA cron tab")
 
         status = ""
 
         run_start = datetime.now(ZoneInfo('UTC'))
+        self.run_start = run_start
         status += f"Start cron: {str(run_start)} UTC\n"
+        self.load_warehouse_metadata()
+        self.load_checkpoints()
         course_verification = self.verify_course_ids()
         invalid_course_id_list = course_verification.invalid_course_ids
         if len(invalid_course_id_list) > 0:
@@ -661,33 +1135,40 @@ def do(self) -> str:
         logger.info(f'Valid locked course IDs: {self.valid_locked_course_ids}')
 
         # continue cron tasks
+        warehouse_unchanged = self.is_warehouse_unchanged()
 
         status += self.update_term()
 
+        # Update the date unless there is an exception
+        exception_in_run = False
         if len(self.valid_locked_course_ids) == 0:
             logger.info("Skipping course-related table updates...")
             status += "Skipped course-related table updates.\n"
         else:
-            # Update the date unless there is an exception
-            exception_in_run = False
             status += self.update_course(course_verification.course_data)
 
-            status += self.update_user()
+            if warehouse_unchanged:
+                logger.info("Warehouse data is unchanged; skipping the full reload of course data.")
+                status += (f"Warehouse canvasdatadate {self.warehouse_data_date} is unchanged; "
+                           "skipped user, assignment and submission updates.\n")
+            else:
+                status += self.run_stage(self.update_user)
 
-            status += self.update_groups()
-            status += self.update_assignment()
-            status += self.submission()
-            status += self.weight_consideration()
+                status += self.run_stage(self.update_groups)
+                status += self.run_stage(self.update_assignment)
+                status += self.run_stage(self.submission)
+                status += self.run_stage(self.weight_consideration)
             if 'show_resources_accessed' not in settings.VIEWS_DISABLED:
                 try:
-                    status += self.update_resource_access()
+                    status += self.load_resource_access()
                     status += self.update_canvas_resource()
                 except Exception as e:
                     logger.error(f"Exception running BigQuery update: {str(e)}")
                     status += str(e)
                     exception_in_run = True
 
-        status += self.update_unizin_metadata()
+        if not warehouse_unchanged:
+            status += self.update_unizin_metadata()
 
         all_str_course_ids = set(
             str(x) for x in Course.objects.get_supported_courses().values_list('id', flat=True)
@@ -701,10 +1182,21 @@ def do(self) -> str:
         # Set all of the courses to have been updated now (this is the same set update_course runs on)
         if not exception_in_run:
             logger.info(f"Updating all valid courses from when this run was started at {run_start}")
-            Course.objects.filter(id__in=self.valid_locked_course_ids).update(data_last_updated=run_start)
+            resumed_course_ids_by_run_start = defaultdict(list)
+            for course_id, resumed_run_start in self.resumed_course_run_starts.items():
+                resumed_course_ids_by_run_start[resumed_run_start].append(course_id)
+            Course.objects.filter(id__in=self.valid_locked_course_ids) \
+                .exclude(id__in=list(self.resumed_course_run_starts)) \
+                .update(data_last_updated=run_start)
+            # Courses loaded by an interrupted run have events up to when that run started
+            for resumed_run_start, course_ids in resumed_course_ids_by_run_start.items():
+                Course.objects.filter(id__in=course_ids).update(data_last_updated=resumed_run_start)
+            CronCheckpoint.objects.all().delete()
         else:
             logger.warn("data_last_updated not updated because of an Exception during this run")
 
+        status += self.bq_query_stats_status()
+        status += db_util.pool_metrics_status()
 
         if settings.LRS_IS_BIGQUERY:
             total_tbytes_billed = self.total_bytes_billed / 1024 / 1024 / 1024 / 1024
@@ -0,0 +1,149 @@
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from dashboard.common import db_util
+from dashboard.cron import DashboardCronJob
+from dashboard.models import CronShardLock
+
+
+logger = logging.getLogger(__name__)
+
+
+def shard_lock_expiry() -> datetime:
+    # A coordinator stops waiting for its shards CRON_SHARD_TIMEOUT_SECONDS after creating them, so locks not updated
+    # since then belong to a coordinator that gave up or was killed
+    return timezone.now() - timedelta(seconds=settings.CRON_SHARD_TIMEOUT_SECONDS)
+
+
+def partition_course_ids(course_ids: List[str], shards: int) -> List[List[str]]:
+    # Round robin keeps the shards the same size and gives a course the same shard while the course list is unchanged
+    return [shard_course_ids for shard_course_ids in (course_ids[shard::shards] for shard in range(shards)) if shard_course_ids]
+
+
+class ShardedDashboardCronJob(DashboardCronJob):
+    """
+    Coordinates a cron run whose resource access loading is split across worker processes or pods.
+
+    The coordinator runs every stage of DashboardCronJob except update_resource_access itself. It partitions the
+    valid course ids into shards recorded in the cron_shard_lock table, optionally starts local worker processes,
+    and waits for workers to finish every shard before committing data_last_updated.
+    """
+
+    def __init__(self, shards: int, processes: int) -> None:
+        super().__init__()
+        self.shards = shards
+        self.processes = processes
+
+    def load_resource_access(self) -> str:
+        for shard, course_ids in enumerate(partition_course_ids(self.valid_locked_course_ids, self.shards)):
+            CronShardLock.objects.create(
+                run_start=self.run_start, shard=shard, course_ids=course_ids,
+                warehouse_data_date=self.warehouse_data_date)
+
+        # Workers are separate processes, so they need their own database connections
+        manage_py = os.path.join(settings.BASE_DIR, 'manage.py')
+        worker_processes = [
+            subprocess.Popen([sys.executable, manage_py, 'run_sharded_cron', '--worker'])
+            for _ in range(self.processes)
+        ]
+        try:
+            shard_locks = self.wait_for_shards()
+        finally:
+            for worker_process in worker_processes:
+                if worker_process.poll() is None:
+                    worker_process.terminate()
+
+        status = ""
+        failed_shards = []
+        for shard_lock in shard_locks:
+            status += f"Shard {shard_lock.shard} ({shard_lock.worker}, {len(shard_lock.course_ids)} courses): {shard_lock.state}\n"
+            status += shard_lock.status
+            if shard_lock.state != CronShardLock.State.DONE:
+                failed_shards.append(shard_lock.shard)
+            for course_id, resumed_run_start in shard_lock.resumed_course_run_starts.items():
+                self.resumed_course_run_starts[course_id] = datetime.fromisoformat(resumed_run_start)
+
+        if failed_shards:
+            raise Exception(f"{status}Resource access shards {failed_shards} did not complete")
+        return status
+
+    def wait_for_shards(self) -> List[CronShardLock]:
+        deadline = time.monotonic() + settings.CRON_SHARD_TIMEOUT_SECONDS
+        unfinished_states = (CronShardLock.State.PENDING, CronShardLock.State.RUNNING)
+        while True:
+            shard_locks = list(CronShardLock.objects.filter(run_start=self.run_start).order_by('shard'))
+            unfinished_shards = [shard_lock.shard for shard_lock in shard_locks if shard_lock.state in unfinished_states]
+            if not unfinished_shards:
+                return shard_locks
+            if time.monotonic() > deadline:
+                logger.error(f'Timed out waiting for resource access shards {unfinished_shards}')
+                return shard_locks
+            time.sleep(settings.CRON_SHARD_POLL_SECONDS)
+
+    def do(self) -> str:
+        stale_lock_count, _ = CronShardLock.objects.filter(updated_at__lt=shard_lock_expiry()).delete()
+        if stale_lock_count:
+            logger.warning(f'Deleted {stale_lock_count} shard lock(s) left by an earlier run')
+        try:
+            return super().do()
+        finally:
+            CronShardLock.objects.filter(run_start=self.run_start).delete()
+
+
+def claim_shard() -> Optional[CronShardLock]:
+    """
+    Marks the first pending shard of the latest run as running by this process. SKIP LOCKED lets workers
+    claim shards concurrently without waiting on each other.
+    """
+    with transaction.atomic():
+        shard_lock = CronShardLock.objects.select_for_update(skip_locked=True) \
+            .filter(state=CronShardLock.State.PENDING, updated_at__gte=shard_lock_expiry()) \
+            .order_by('-run_start', 'shard').first()
+        if shard_lock is None:
+            return None
+        shard_lock.state = CronShardLock.State.RUNNING
+        shard_lock.worker = f'{socket.gethostname()}:{os.getpid()}'
+        shard_lock.save(update_fields=['state', 'worker', 'updated_at'])
+    return shard_lock
+
+
+def run_shard(shard_lock: CronShardLock) -> None:
+    """Runs update_resource_access for the courses of a claimed shard, recording the outcome in its lock row"""
+    cron_job = DashboardCronJob()
+    cron_job.run_start = shard_lock.run_start
+    cron_job.warehouse_data_date = shard_lock.warehouse_data_date
+    cron_job.valid_locked_course_ids = shard_lock.course_ids
+    try:
+        cron_job.load_checkpoints(prune=False)
+        shard_lock.status = cron_job.update_resource_access() + cron_job.bq_query_stats_status() + \
+            db_util.pool_metrics_status()
+        shard_lock.state = CronShardLock.State.DONE
+    except Exception as e:
+        logger.exception(f'Error loading resource access for shard {shard_lock.shard}')
+        shard_lock.status = f"{e}\n"
+        shard_lock.state = CronShardLock.State.FAILED
+    shard_lock.resumed_course_run_starts = {
+        course_id: resumed_run_start.isoformat()
+        for course_id, resumed_run_start in cron_job.resumed_course_run_starts.items()
+    }
+    shard_lock.save()
+
+
+def run_worker() -> int:
+    """Claims and runs shards until none are pending, returning the number run"""
+    shards_run = 0
+    while (shard_lock := claim_shard()) is not None:
+        logger.info(f'Running resource access shard {shard_lock.shard} of run started at {shard_lock.run_start}')
+        run_shard(shard_lock)
+        shards_run += 1
+    return shards_run
@@ -78,12 +78,16 @@ def batch_load_fn(self, keys):
 
         return Promise.resolve([results.get(key, []) for key in keys])
 
-class SubmissionByAssignmentIdAndUserIdLoader(DataLoader):
+class SubmissionsByCourseIdAndUserIdLoader(DataLoader):
+    """
+    Loads all of a user's submissions in a course with one query per key.
+    Each result is a dict of submissions keyed by assignment_id.
+    """
     def batch_load_fn(self, keys):
-        results = defaultdict(None)
+        results = defaultdict(dict)
 
         queries = [
-            Q(assignment_id=key.get('assignment_id')) & Q(user_id=key.get('user_id')) for key in keys
+            Q(course_id=key.get('course_id')) & Q(user_id=key.get('user_id')) for key in keys
         ]
 
         if len(queries) > 0:
@@ -92,10 +96,10 @@ def batch_load_fn(self, keys):
                 query |= item
 
             for result in Submission.objects.filter(query).iterator():
-                results[f"assignment_id:{result.assignment_id}|user_id:{result.user_id}"] = result
+                results[f"course_id:{result.course_id}|user_id:{result.user_id}"][result.assignment_id] = result
 
         return Promise.resolve([
-            results.get(self.get_cache_key(key)) for key in keys
+            results.get(self.get_cache_key(key), {}) for key in keys
         ])
 
 class AssignmentGroupsByCourseIdLoader(DataLoader):
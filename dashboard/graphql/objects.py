@@ -2,8 +2,8 @@
 from graphene_django import DjangoObjectType
 import graphene
 from django.conf import settings
-import numpy as np
 import json
+import statistics
 
 from graphql import GraphQLError
 
@@ -113,11 +113,14 @@ def resolve_submissions(parent, info):
 
     def resolve_current_user_submission(parent, info):
         canvas_user_id = info.context.canvas_user_id
+        if canvas_user_id is None:
+            return None
 
-        return info.context.submission_by_assignment_id_and_user_id_loader.load({
-            'assignment_id': parent.id,
+        # All of the user's submissions in the course are fetched together, then picked out per assignment
+        return info.context.submissions_by_course_id_and_user_id_loader.load({
+            'course_id': parent.course_id,
             'user_id': canvas_user_id,
-        })
+        }).then(lambda submissions: submissions.get(parent.id))
 
     def resolve_assignment_group(parent, info):
         return info.context.assignment_group_by_course_id_and_id_loader.load({
@@ -127,7 +130,7 @@ def resolve_assignment_group(parent, info):
 
     def _average_grade_lambda(parent, info, submissions):
         if len(submissions) > 0:
-            return np.average([submission.score if submission.score else 0 for submission in submissions])
+            return statistics.fmean([submission.score if submission.score else 0 for submission in submissions])
         return 0
 
     def resolve_average_grade(parent, info):
@@ -137,7 +140,7 @@ def resolve_average_grade(parent, info):
 
     def _median_grade_lambda(parent, info, submissions):
         if len(submissions) > 0:
-            return np.median([submission.score if submission.score else 0 for submission in submissions])
+            return statistics.median([submission.score if submission.score else 0 for submission in submissions])
         return 0
 
     def resolve_median_grade(parent, info):
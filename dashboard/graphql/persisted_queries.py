@@ -0,0 +1,145 @@
+import hashlib
+import logging
+import os
+import re
+from copy import copy
+from typing import Collection, Dict, Iterable, List, Optional, Type
+
+from graphql import ASTValidationRule, DocumentNode, FieldNode, GraphQLError, GraphQLSchema, NameNode, \
+    OperationDefinitionNode, Visitor, parse, print_ast, validate, visit
+
+logger = logging.getLogger(__name__)
+
+# Body of a gql`...` tagged template literal in the React frontend; literals using ${} interpolation are skipped
+GQL_TEMPLATE_PATTERN = re.compile(r'gql`([^`]*)`')
+QUERY_FILE_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx')
+GRAPHQL_FILE_EXTENSIONS = ('.graphql', '.gql')
+
+TYPENAME_FIELD = FieldNode(name=NameNode(value='__typename'), arguments=(), directives=())
+
+
+def hash_query(query: str) -> str:
+    """Returns the SHA-256 hex digest used by Apollo persisted queries to identify a document"""
+    return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+
+class AddTypenameVisitor(Visitor):
+    """
+    Mirrors Apollo Client's addTypenameToDocument, which the InMemoryCache applies before a query is
+    hashed and sent, so the registry can recognize the documents the browser actually sends.
+    """
+
+    def enter_selection_set(self, node, key, parent, *_args):
+        if isinstance(parent, OperationDefinitionNode):
+            return None
+        if any(isinstance(selection, FieldNode) and selection.name.value.startswith('__')
+               for selection in node.selections):
+            return None
+        node = copy(node)
+        node.selections = (*node.selections, TYPENAME_FIELD)
+        return node
+
+
+def add_typename_to_document(document: DocumentNode) -> DocumentNode:
+    return visit(document, AddTypenameVisitor())
+
+
+class PersistedQueryRegistry:
+    """
+    Maps query hashes to the text and parsed document of queries that have already been validated against
+    the schema, so clients can send only the hash and known queries skip parsing and validation.
+    """
+
+    def __init__(
+        self, schema: GraphQLSchema, validation_rules: Optional[Collection[Type[ASTValidationRule]]] = None
+    ) -> None:
+        self.schema = schema
+        self.validation_rules = validation_rules
+        self.queries: Dict[str, str] = {}
+        self.documents: Dict[str, DocumentNode] = {}
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def get(self, query_hash: Optional[str]) -> Optional[str]:
+        if not query_hash:
+            return None
+        return self.queries.get(query_hash)
+
+    def get_document(self, query: Optional[str]) -> Optional[DocumentNode]:
+        if not query:
+            return None
+        return self.documents.get(hash_query(query))
+
+    def register(self, source: str, source_name: str = '') -> List[str]:
+        """
+        Parses and validates a document, registering both its printed form and the form Apollo Client
+        sends (with __typename added). Invalid documents are logged and skipped.
+
+        :return: List of hashes registered for the document
+        """
+        try:
+            document = parse(source)
+        except GraphQLError as e:
+            logger.warning(f'Skipping persisted query from {source_name} that could not be parsed: {e}')
+            return []
+
+        validation_errors = validate(self.schema, document, self.validation_rules)
+        if validation_errors:
+            logger.warning(f'Skipping persisted query from {source_name} that is not valid: {validation_errors}')
+            return []
+
+        query_hashes = []
+        for variant in (document, add_typename_to_document(document)):
+            query = print_ast(variant)
+            query_hash = hash_query(query)
+            self.queries[query_hash] = query
+            # Parsed from the printed text, so the locations in any error refer to the query the client sent
+            self.documents[query_hash] = parse(query)
+            query_hashes.append(query_hash)
+        return query_hashes
+
+    def register_file(self, file_path: str) -> None:
+        try:
+            with open(file_path, encoding='utf-8') as query_file:
+                contents = query_file.read()
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f'Could not read persisted query file {file_path}: {e}')
+            return
+
+        if file_path.endswith(GRAPHQL_FILE_EXTENSIONS):
+            sources = [contents]
+        else:
+            sources = [source for source in GQL_TEMPLATE_PATTERN.findall(contents) if '${' not in source]
+
+        for source in sources:
+            self.register(source, file_path)
+
+    def register_paths(self, paths: Iterable[str]) -> None:
+        for path in paths:
+            if os.path.isfile(path):
+                self.register_file(path)
+                continue
+            if not os.path.isdir(path):
+                logger.info(f'Persisted query path {path} does not exist; skipping.')
+                continue
+            for dir_path, dir_names, file_names in os.walk(path):
+                # Test files are not sent by the running frontend
+                dir_names[:] = [name for name in dir_names if name not in ('__tests__', 'node_modules')]
+                for file_name in file_names:
+                    if file_name.endswith(QUERY_FILE_EXTENSIONS + GRAPHQL_FILE_EXTENSIONS):
+                        self.register_file(os.path.join(dir_path, file_name))
+
+    @classmethod
+    def from_paths(
+        cls, schema: GraphQLSchema, paths: Iterable[str],
+        validation_rules: Optional[Collection[Type[ASTValidationRule]]] = None
+    ) -> 'PersistedQueryRegistry':
+        registry = cls(schema, validation_rules)
+        registry.register_paths(paths)
+        if registry:
+            logger.info(f'Registered {len(registry)} persisted GraphQL query hashes.')
+        else:
+            # Every request then sends the full query text and is validated again
+            logger.warning('No persisted GraphQL queries were found; check GRAPHQL_PERSISTED_QUERY_PATHS.')
+        return registry
@@ -0,0 +1,78 @@
+import logging
+from typing import FrozenSet
+
+from django.conf import settings
+from graphql import FieldNode, FragmentSpreadNode, GraphQLError, InlineFragmentNode, \
+    OperationDefinitionNode, SelectionSetNode, ValidationRule, get_named_type, get_nullable_type, \
+    is_list_type
+from graphql.type import GraphQLNamedType
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCostRule(ValidationRule):
+    """
+    Estimates the cost of each operation before it is executed and rejects operations over MAX_COST.
+
+    Each field costs its weight from FIELD_COSTS (keyed by "TypeName.fieldName", falling back to
+    DEFAULT_FIELD_COST). The cost of a list field's sub-selection is multiplied by its expected size from
+    LIST_SIZES (falling back to DEFAULT_LIST_SIZE), so nesting lists such as assignments -> submissions grows
+    the cost the same way it grows the number of resolved objects.
+    """
+
+    def enter_operation_definition(self, node: OperationDefinitionNode, *_args):
+        root_type = self.context.schema.get_root_type(node.operation)
+        if root_type is None:
+            return
+        cost = self.selection_set_cost(node.selection_set, root_type, frozenset())
+        operation_name = node.name.value if node.name else 'anonymous'
+        logger.debug(f'GraphQL operation {operation_name} has an estimated cost of {cost}')
+
+        max_cost = settings.GRAPHQL_QUERY_COST['MAX_COST']
+        if cost > max_cost:
+            logger.warning(f'Rejected GraphQL operation {operation_name} with estimated cost {cost} (max {max_cost})')
+            self.report_error(GraphQLError(
+                f'Query cost {cost} exceeds the maximum allowed cost of {max_cost}.', node
+            ))
+
+    def selection_set_cost(
+        self, selection_set: SelectionSetNode, parent_type: GraphQLNamedType, visited_fragments: FrozenSet[str]
+    ) -> int:
+        cost = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                cost += self.field_cost(selection, parent_type, visited_fragments)
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = (
+                    self.context.schema.get_type(selection.type_condition.name.value)
+                    if selection.type_condition else parent_type
+                )
+                cost += self.selection_set_cost(selection.selection_set, fragment_type, visited_fragments)
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment_name = selection.name.value
+                fragment = self.context.get_fragment(fragment_name)
+                # Unknown and cyclic fragments are reported by the standard validation rules
+                if fragment is None or fragment_name in visited_fragments:
+                    continue
+                fragment_type = self.context.schema.get_type(fragment.type_condition.name.value)
+                cost += self.selection_set_cost(
+                    fragment.selection_set, fragment_type, visited_fragments | {fragment_name})
+        return cost
+
+    def field_cost(self, node: FieldNode, parent_type: GraphQLNamedType, visited_fragments: FrozenSet[str]) -> int:
+        field_name = node.name.value
+        fields = getattr(parent_type, 'fields', None)
+        if field_name.startswith('__') or fields is None or field_name not in fields:
+            return 0
+
+        cost_settings = settings.GRAPHQL_QUERY_COST
+        field_key = f'{parent_type.name}.{field_name}'
+        cost = cost_settings['FIELD_COSTS'].get(field_key, cost_settings['DEFAULT_FIELD_COST'])
+
+        if node.selection_set is not None:
+            field_type = fields[field_name].type
+            child_cost = self.selection_set_cost(node.selection_set, get_named_type(field_type), visited_fragments)
+            if is_list_type(get_nullable_type(field_type)):
+                child_cost *= cost_settings['LIST_SIZES'].get(field_key, cost_settings['DEFAULT_LIST_SIZE'])
+            cost += child_cost
+        return cost
@@ -1,14 +1,26 @@
-from graphene_django.views import GraphQLView
+import json
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.http import HttpResponse, HttpResponseNotAllowed
+from graphene_django.constants import MUTATION_ERRORS_FLAG
+from graphene_django.settings import graphene_settings
+from graphene_django.views import GraphQLView, HttpError
 from django.contrib.auth.mixins import LoginRequiredMixin
+from graphql import ExecutionResult, OperationType, execute, get_operation_ast, specified_rules
 from graphql_core_promise import PromiseExecutionContext
 from dashboard.common.db_util import canvas_id_to_incremented_id
 from dashboard.graphql.loaders import AssignmentsByCourseIdLoader, \
-    SubmissionsByAssignmentIdLoader, SubmissionByAssignmentIdAndUserIdLoader, \
+    SubmissionsByAssignmentIdLoader, SubmissionsByCourseIdAndUserIdLoader, \
     AssignmentByCourseIdAndIdLoader, AssignmentsByAssignmentGroupIdLoader, \
     AssignmentByAssignmentGroupIdAndIdLoader, AssignmentGroupsByCourseIdLoader, \
     AssignmentGroupByCourseIdAndIdLoader, AssignmentWeightConsiderationByCourseIdLoader, \
     UserDefaultSelectionsByCourseIdAndUserLoader, UserDefaultSelectionByCourseIdAndUserAndViewTypeLoader, \
     AcademicTermByIdLoader
+from dashboard.graphql.persisted_queries import PersistedQueryRegistry
+from dashboard.graphql.query_cost import QueryCostRule
+from dashboard.graphql.schema import schema
+from dashboard.middleware.resolvertiming import log_resolver_timings
 from django.db.models import Q
 from dashboard.models import User
 from pinax.eventlog.models import log as eventlog
@@ -16,9 +28,18 @@
 import logging
 logger = logging.getLogger(__name__)
 
+VALIDATION_RULES = (*specified_rules, QueryCostRule)
+
+# Built once at startup so clients can send only the hash of a known frontend query, which is neither parsed
+# nor validated again
+persisted_query_registry = PersistedQueryRegistry.from_paths(
+    schema.graphql_schema, settings.GRAPHQL_PERSISTED_QUERY_PATHS, VALIDATION_RULES)
+
 
 class DashboardGraphQLView(LoginRequiredMixin, GraphQLView):
     execution_context_class = PromiseExecutionContext
+    validation_rules = VALIDATION_RULES
+
     def get_context(self, request):
         loaders = {
             'assignment_weight_consideration_by_course_id_loader': AssignmentWeightConsiderationByCourseIdLoader(
@@ -39,8 +60,8 @@ def get_context(self, request):
             'submissions_by_assignment_id_loader': SubmissionsByAssignmentIdLoader(
                 get_cache_key=(lambda key: key)
             ),
-            'submission_by_assignment_id_and_user_id_loader': SubmissionByAssignmentIdAndUserIdLoader(
-                get_cache_key=(lambda key: f"assignment_id:{key.get('assignment_id')}|user_id:{key.get('user_id')}")
+            'submissions_by_course_id_and_user_id_loader': SubmissionsByCourseIdAndUserIdLoader(
+                get_cache_key=(lambda key: f"course_id:{key.get('course_id')}|user_id:{key.get('user_id')}")
             ),
             'assignment_groups_by_course_id_loader': AssignmentGroupsByCourseIdLoader(
                 get_cache_key=(lambda key: key)
@@ -80,7 +101,74 @@ def execute_graphql_request(self, request, data, query, variables, operation_nam
             }
             eventlog(request.user, EventLogTypes.EVENT_VIEW_ASSIGNMENT_PLANNING_WITH_GOAL_SETTING.value, extra=event_data)
 
+        document = persisted_query_registry.get_document(query)
+        if document is not None:
+            result = self.execute_persisted_document(
+                request, document, variables, operation_name, show_graphiql
+            )
+        else:
+            result = super(DashboardGraphQLView, self).execute_graphql_request(
+                request, data, query, variables, operation_name, show_graphiql
+            )
+        log_resolver_timings(request, operation_name)
+        return result
+
+    def execute_persisted_document(self, request, document, variables, operation_name, show_graphiql=False):
+        """
+        GraphQLView.execute_graphql_request for a document the persisted query registry parsed and validated
+        at startup, without parsing and validating it again
+        """
+        operation_ast = get_operation_ast(document, operation_name)
+        if request.method.lower() == 'get' and operation_ast is not None \
+                and operation_ast.operation != OperationType.QUERY:
+            if show_graphiql:
+                return None
+            raise HttpError(HttpResponseNotAllowed(
+                ['POST'], f'Can only perform a {operation_ast.operation.value} operation from a POST request.'
+            ))
+
+        try:
+            execute_options = {
+                'root_value': self.get_root_value(request),
+                'context_value': self.get_context(request),
+                'variable_values': variables,
+                'operation_name': operation_name,
+                'middleware': self.get_middleware(request),
+                'execution_context_class': self.execution_context_class,
+            }
+            if operation_ast is not None and operation_ast.operation == OperationType.MUTATION and (
+                graphene_settings.ATOMIC_MUTATIONS is True or
+                connection.settings_dict.get('ATOMIC_MUTATIONS', False) is True
+            ):
+                with transaction.atomic():
+                    result = execute(self.schema.graphql_schema, document, **execute_options)
+                    if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+                        transaction.set_rollback(True)
+                return result
+
+            return execute(self.schema.graphql_schema, document, **execute_options)
+        except Exception as e:
+            return ExecutionResult(errors=[e])
+
+    def get_graphql_params(self, request, data):
+        query, variables, operation_name, id = super(DashboardGraphQLView, self).get_graphql_params(request, data)
+        if not query:
+            query_hash = self.get_persisted_query_hash(request, data)
+            query = persisted_query_registry.get(query_hash)
+            if query_hash and query is None:
+                # Lets Apollo's persisted query link retry with the full query text
+                raise HttpError(HttpResponse(), 'PersistedQueryNotFound')
+        return query, variables, operation_name, id
 
-        return super(DashboardGraphQLView, self).execute_graphql_request(
-            request, data, query, variables, operation_name, show_graphiql
-        )
\ No newline at end of file
+    @staticmethod
+    def get_persisted_query_hash(request, data):
+        extensions = request.GET.get('extensions') or data.get('extensions')
+        if isinstance(extensions, str):
+            try:
+                extensions = json.loads(extensions)
+            except ValueError:
+                return None
+        if not isinstance(extensions, dict):
+            return None
+        persisted_query = extensions.get('persistedQuery') or {}
+        return persisted_query.get('sha256Hash') if isinstance(persisted_query, dict) else None
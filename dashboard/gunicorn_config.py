@@ -0,0 +1,51 @@
+# Gunicorn settings and hooks, loaded by start.sh with --config python:dashboard.gunicorn_config.
+# With GUNICORN_PRELOAD the master imports the application once and workers share its memory copy-on-write;
+# these hooks keep that memory shared and keep database connections out of the master.
+import gc
+import logging
+import os
+
+from debug_utils.debugpy import strtobool
+
+logger = logging.getLogger(__name__)
+
+preload_app = strtobool(os.getenv('GUNICORN_PRELOAD') or 'False')
+
+if preload_app:
+    # This module is loaded before the master imports the application. Collections during that import would free
+    # and move objects around the pages workers are about to share, so gc stays off until when_ready freezes them.
+    gc.disable()
+
+
+def when_ready(server):
+    if not server.cfg.preload_app:
+        return
+    from django.conf import settings
+    from django.urls import get_resolver
+
+    # Build what every worker would otherwise build on its first request: the URLconf (with the views and the
+    # compiled GraphQL schema it imports), the resolver's reverse lookups and the LTI tool configuration
+    get_resolver().reverse_dict
+    if settings.ENABLE_LTI:
+        from dashboard.lti_new import get_tool_conf
+        get_tool_conf()
+    # Objects loaded so far are never collected, so collections in workers do not write to their shared pages
+    gc.freeze()
+    gc.enable()
+    logger.info('Preloaded the application in the gunicorn master')
+
+
+def pre_fork(server, worker):
+    if not server.cfg.preload_app:
+        return
+    from django.db import connections
+    from dashboard.common.db_util import dispose_shared_engines
+
+    # Connections opened in the master must not be shared by workers; each worker opens its own on first use
+    connections.close_all()
+    dispose_shared_engines()
+
+
+def post_fork(server, worker):
+    # Workers collect their own garbage as usual; the frozen objects from the master are left alone
+    gc.enable()
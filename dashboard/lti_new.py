@@ -1,3 +1,4 @@
+import functools
 import logging
 import random
 import string
@@ -64,6 +65,8 @@ def __str__(self):
         return f'({self.lti_error}) -> "{self.message}"'
 
 
+# Reads the key files once per process (in the gunicorn master, when preloaded)
+@functools.lru_cache(maxsize=None)
 def get_tool_conf():
     lti_config = settings.LTI_CONFIG
 
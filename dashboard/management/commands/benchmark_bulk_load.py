@@ -0,0 +1,58 @@
+import time
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from sqlalchemy import text
+
+from dashboard.common import db_util
+from dashboard.common.bulk_load import load_data_infile
+
+BENCHMARK_TABLE = 'resource_access_bulk_load_benchmark'
+
+
+class Command(BaseCommand):
+    help = ('Times appending generated resource_access rows with LOAD DATA LOCAL INFILE and with DataFrame.to_sql, '
+            'using a scratch copy of the resource_access table that is dropped afterwards.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', dest='rows', type=int, default=100000)
+        parser.add_argument('--chunksizes', dest='chunksizes', type=int, nargs='+', default=[1000, 10000, 50000])
+
+    def handle(self, *args, **options):
+        rows = options.get('rows')
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'resource_id': rng.integers(1, 10000, rows),
+            'course_id': settings.CANVAS_DATA_ID_INCREMENT + rng.integers(1, 100, rows),
+            'user_id': settings.CANVAS_DATA_ID_INCREMENT + rng.integers(1, 50000, rows),
+            'access_time': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 10 ** 7, rows), unit='s'),
+        })
+
+        engine = db_util.create_sqlalchemy_engine(
+            settings.DATABASES['default'], connect_args={'local_infile': 1})
+        methods = [('LOAD DATA LOCAL INFILE', lambda: load_data_infile(engine, df, BENCHMARK_TABLE))]
+        methods += [
+            (f"to_sql(method='multi', chunksize={chunksize})",
+             lambda chunksize=chunksize: df.to_sql(con=engine, name=BENCHMARK_TABLE, if_exists='append',
+                                                   index=False, method='multi', chunksize=chunksize))
+            for chunksize in options.get('chunksizes')
+        ]
+        methods.append(('to_sql()', lambda: df.to_sql(con=engine, name=BENCHMARK_TABLE, if_exists='append', index=False)))
+
+        with engine.begin() as connection:
+            connection.execute(text(f'DROP TABLE IF EXISTS {BENCHMARK_TABLE}'))
+            # LIKE copies columns and indexes but not foreign keys, so generated ids can be loaded
+            connection.execute(text(f'CREATE TABLE {BENCHMARK_TABLE} LIKE resource_access'))
+        try:
+            for name, write in methods:
+                with engine.begin() as connection:
+                    connection.execute(text(f'TRUNCATE TABLE {BENCHMARK_TABLE}'))
+                start = time.perf_counter()
+                write()
+                elapsed = time.perf_counter() - start
+                self.stdout.write(f'{name}: {rows} rows in {elapsed:.2f}s ({rows / elapsed:.0f} rows/s)')
+        finally:
+            with engine.begin() as connection:
+                connection.execute(text(f'DROP TABLE IF EXISTS {BENCHMARK_TABLE}'))
@@ -0,0 +1,81 @@
+import gzip
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.contrib.auth.models import User as DjangoUser
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from dashboard import views
+
+# Libraries only the cron needs; a web worker should not import any of them at startup
+CRON_ONLY_MODULES = ('google.cloud.bigquery', 'pandas', 'pangres', 'pyarrow', 'numpy', 'sqlalchemy')
+
+# Run in a fresh interpreter, so the modules a web worker loads at startup are measured from scratch
+STARTUP_SCRIPT = f'''
+import sys, time
+start = time.perf_counter()
+import dashboard.wsgi
+import dashboard.urls
+elapsed = time.perf_counter() - start
+loaded = [name for name in {CRON_ONLY_MODULES!r} if name in sys.modules]
+print(f"{{elapsed:.3f}} {{','.join(loaded) or '-'}}")
+'''
+
+
+class Command(BaseCommand):
+    help = ('Times the startup of a web worker (dashboard.wsgi and URLconf import), failing if it imports a cron-only '
+            'library or exceeds --startup_budget. With --course_id and --username, also times the REST views for a course '
+            'as that user and reports their response sizes; each timed request is recorded in the event log like a real '
+            'one.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course_id', dest='course_id', type=str, help='Canvas course id')
+        parser.add_argument('--username', dest='username', type=str,
+                            help='Username of an admin or a user enrolled in the course')
+        parser.add_argument('--requests', dest='requests', type=int, default=20, help='Requests timed per view')
+        parser.add_argument('--startup_runs', dest='startup_runs', type=int, default=3)
+        parser.add_argument('--startup_budget', dest='startup_budget', type=float,
+                            help='Fail if the fastest startup takes longer than this many seconds')
+
+    def handle(self, *args, **options):
+        startup_seconds = []
+        for _ in range(options['startup_runs']):
+            output = subprocess.run(
+                [sys.executable, '-c', STARTUP_SCRIPT], check=True, capture_output=True, text=True,
+                env={**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'dashboard.settings')}
+            ).stdout.split()
+            startup_seconds.append(float(output[0]))
+            loaded_modules = output[1]
+            self.stdout.write(f'startup: {startup_seconds[-1]:.3f}s, cron-only modules loaded: {loaded_modules}')
+
+        if loaded_modules != '-':
+            raise CommandError(f'A web worker imports cron-only modules: {loaded_modules}')
+        if options['startup_budget'] is not None and min(startup_seconds) > options['startup_budget']:
+            raise CommandError(f'Startup took {min(startup_seconds):.3f}s, over the budget of {options["startup_budget"]}s')
+
+        if not options['course_id'] or not options['username']:
+            return
+        user = DjangoUser.objects.get(username=options['username'])
+        request_factory = RequestFactory()
+        endpoints = [
+            ('resource_access_within_week', views.resource_access_within_week,
+             {'week_num_start': 1, 'week_num_end': 16, 'grade': 'all', 'resource_type': ','.join(views.RESOURCE_VALUES)}),
+            ('grade_distribution', views.grade_distribution, {}),
+        ]
+        for name, view, params in endpoints:
+            timings = []
+            for _ in range(options['requests']):
+                request = request_factory.get('/', params)
+                request.user = user
+                start = time.perf_counter()
+                response = view(request, course_id=options['course_id'])
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(f'{name}: median {statistics.median(timings):.1f}ms, p95 {p95:.1f}ms, '
+                              f'{len(timings)} requests, {len(response.content)} bytes '
+                              f'({len(gzip.compress(response.content))} gzipped)')
@@ -0,0 +1,76 @@
+from typing import Any, Dict, Iterator, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from dashboard.models import User
+
+STUDENT = str(User.EnrollmentType.STUDENT)
+TEACHER = str(User.EnrollmentType.TEACHER)
+
+# The filtering shapes of the hot lookups in views.py, rules.py, graphql/loaders.py and common/db_util.py
+HOT_QUERIES = [
+    ('views.resource_access_within_week: student count',
+     'SELECT count(*) FROM user WHERE course_id = %s AND enrollment_type = %s', [0, STUDENT]),
+    ('views.resource_access_within_week: resource access',
+     '''SELECT r.resource_id, r.resource_type, r.name, u.current_grade, a.user_id
+        FROM resource r, resource_access a, user u, course c, academic_terms t
+        WHERE a.resource_id = r.id AND a.user_id = u.user_id
+        AND a.course_id = c.id AND c.term_id = t.id
+        AND a.access_time > %s AND a.access_time < %s
+        AND a.course_id = %s AND u.course_id = %s AND u.enrollment_type = %s''',
+     ['2000-01-01', '2000-01-08', 0, 0, STUDENT]),
+    ('views.resource_access_within_week: own access',
+     '''SELECT r.resource_id, count(*), max(a.access_time)
+        FROM resource_access a, user u, resource r
+        WHERE a.user_id = u.user_id AND a.resource_id = r.id
+        AND u.sis_name = %s AND a.course_id = %s AND a.course_id = u.course_id
+        GROUP BY r.resource_id, r.resource_type, r.name''', ['', 0]),
+    ('views.grade_distribution',
+     'SELECT current_grade FROM user WHERE course_id = %s AND enrollment_type = %s', [0, STUDENT]),
+    ('rules.is_enrolled_in_course_id',
+     'SELECT count(*) FROM user WHERE sis_name = %s AND course_id = %s', ['', 0]),
+    ('rules.is_instructor_in_course_id',
+     'SELECT count(*) FROM user WHERE sis_name = %s AND course_id = %s AND enrollment_type = %s', ['', 0, TEACHER]),
+    ('db_util.get_default_user_course_id',
+     'SELECT course_id FROM user WHERE sis_name = %s ORDER BY course_id DESC LIMIT 1', ['']),
+    ('loaders.AssignmentsByCourseIdLoader',
+     'SELECT * FROM assignment WHERE course_id IN (%s)', [0]),
+    ('loaders.AssignmentsByAssignmentGroupIdLoader',
+     'SELECT * FROM assignment WHERE assignment_group_id IN (%s)', [0]),
+    ('loaders.SubmissionsByAssignmentIdLoader',
+     'SELECT * FROM submission WHERE assignment_id IN (%s)', [0]),
+    ('loaders.SubmissionsByCourseIdAndUserIdLoader',
+     'SELECT * FROM submission WHERE course_id = %s AND user_id = %s', [0, 0]),
+    ('loaders.AssignmentGroupsByCourseIdLoader',
+     'SELECT * FROM assignment_groups WHERE course_id IN (%s)', [0]),
+    ('loaders.UserDefaultSelectionsByCourseIdAndUserLoader',
+     'SELECT * FROM user_default_selection WHERE course_id = %s AND user_sis_name = %s', [0, '']),
+]
+
+
+def explain_hot_queries(cursor) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Runs EXPLAIN on each of HOT_QUERIES, yielding the query name and each row of its plan"""
+    for name, sql, params in HOT_QUERIES:
+        cursor.execute(f'EXPLAIN {sql}', params)
+        columns = [column[0] for column in cursor.description]
+        for row in cursor.fetchall():
+            yield name, dict(zip(columns, row))
+
+
+class Command(BaseCommand):
+    help = ('Runs EXPLAIN on the hot lookup queries and fails if any of them does a full table scan. '
+            'Run this against a database with representative data; '
+            'MySQL may choose a table scan for very small tables regardless of indexes.')
+
+    def handle(self, *args, **options):
+        full_scans = []
+        with connection.cursor() as cursor:
+            for name, plan in explain_hot_queries(cursor):
+                self.stdout.write(f"{name}: table={plan.get('table')} type={plan.get('type')} key={plan.get('key')}")
+                if plan.get('type') == 'ALL':
+                    full_scans.append(f"{name} ({plan.get('table')})")
+
+        if full_scans:
+            raise CommandError(f"Full table scans found in: {', '.join(full_scans)}")
+        self.stdout.write('No full table scans found.')
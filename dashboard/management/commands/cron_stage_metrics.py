@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.models import CronStageMetrics
+
+
+class Command(BaseCommand):
+    help = 'Prints the per-stage metrics (time, rows, BigQuery bytes and peak memory growth) of recent cron runs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', dest='runs', type=int, default=5, help='Number of most recent runs to show')
+        parser.add_argument('--stage', dest='stage', type=str, help='Only show this stage, e.g. update_resource_access')
+
+    def handle(self, *args, **options):
+        run_starts = list(
+            CronStageMetrics.objects.order_by('-run_start').values_list('run_start', flat=True).distinct()[:options['runs']]
+        )
+        metrics = CronStageMetrics.objects.filter(run_start__in=run_starts).order_by('-run_start', 'id')
+        if options['stage']:
+            metrics = metrics.filter(stage=options['stage'])
+
+        current_run_start = None
+        for stage_metrics in metrics:
+            if stage_metrics.run_start != current_run_start:
+                current_run_start = stage_metrics.run_start
+                self.stdout.write(f'Run started at {current_run_start}')
+            self.stdout.write(
+                f'  {stage_metrics.stage:<28} {"ok" if stage_metrics.succeeded else "FAILED":<6} '
+                f'{stage_metrics.wall_seconds:>9.1f}s {stage_metrics.rows_read:>12} read {stage_metrics.rows_written:>12} written '
+                f'{stage_metrics.bytes_billed / 1024 ** 3:>9.2f} GiB billed {stage_metrics.peak_rss_growth_bytes / 1024 ** 2:>9.0f} MiB peak RSS growth'
+            )
@@ -0,0 +1,45 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from django.core.management.base import BaseCommand, CommandError
+from django_cron.models import CronJobLog
+
+from dashboard.cron import DashboardCronJob
+from dashboard.cron_shards import ShardedDashboardCronJob, run_worker
+
+
+class Command(BaseCommand):
+    help = ('Runs the dashboard cron with resource access loading split into shards of courses. '
+            'The coordinator starts --processes local workers; workers in other pods can be started with --worker.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--shards', dest='shards', type=int, default=4, help='Number of course shards')
+        parser.add_argument('--processes', dest='processes', type=int,
+                            help='Number of local worker processes to start (default: one per shard)')
+        parser.add_argument('--worker', dest='worker', action='store_true',
+                            help='Run pending shards of the current run instead of coordinating a run')
+
+    def handle(self, *args, **options):
+        if options['worker']:
+            shards_run = run_worker()
+            self.stdout.write(f'Ran {shards_run} shard(s)')
+            return
+
+        shards = options['shards']
+        if shards < 1:
+            raise CommandError('--shards must be at least 1')
+        processes = options['processes'] if options['processes'] is not None else shards
+
+        # Logged like a runcrons run, so the last successful run and its status show up the same way
+        cron_job_log = CronJobLog(code=DashboardCronJob.code, start_time=datetime.now(ZoneInfo('UTC')))
+        try:
+            cron_job_log.message = ShardedDashboardCronJob(shards, processes).do()
+            cron_job_log.is_success = True
+        except Exception as e:
+            cron_job_log.message = str(e)
+            cron_job_log.is_success = False
+            raise
+        finally:
+            cron_job_log.end_time = datetime.now(ZoneInfo('UTC'))
+            cron_job_log.save()
+        self.stdout.write(cron_job_log.message)
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+
+
+class JSONGZipMiddleware(GZipMiddleware):
+    """
+    Compresses JSON responses (the REST API and GraphQL) of at least JSON_GZIP_MIN_LENGTH bytes for clients that
+    accept gzip. Other responses are left alone: static files are compressed ahead of time by WhiteNoise, and
+    HTML pages hold the CSRF token, which compression could expose (BREACH).
+    """
+
+    def process_response(self, request, response):
+        if not response.get('Content-Type', '').startswith('application/json'):
+            return response
+        if not response.streaming and len(response.content) < settings.JSON_GZIP_MIN_LENGTH:
+            return response
+        return super().process_response(request, response)
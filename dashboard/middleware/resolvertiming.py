@@ -0,0 +1,51 @@
+import logging
+import time
+from collections import defaultdict
+
+from promise import is_thenable
+
+logger = logging.getLogger(__name__)
+
+SLOWEST_FIELDS_REPORTED = 10
+
+
+class ResolverTimingMiddleware:
+    """
+    This class records how long each field takes to resolve, including time spent waiting on data loaders.
+    Timings are kept on the request and reported per operation by log_resolver_timings.
+    """
+
+    def resolve(self, next, root, info, **kwargs):
+        timings = getattr(info.context, 'resolver_timings', None)
+        if timings is None:
+            timings = defaultdict(lambda: [0, 0.0, 0.0])
+            setattr(info.context, 'resolver_timings', timings)
+        field_key = f'{info.parent_type.name}.{info.field_name}'
+        start = time.perf_counter()
+
+        def record(value):
+            elapsed = time.perf_counter() - start
+            timing = timings[field_key]
+            timing[0] += 1
+            timing[1] += elapsed
+            timing[2] = max(timing[2], elapsed)
+            return value
+
+        result = next(root, info, **kwargs)
+        if is_thenable(result):
+            return result.then(record)
+        return record(result)
+
+
+def log_resolver_timings(request, operation_name):
+    """Logs the fields with the most total resolve time for the operation, then clears the timings"""
+    timings = getattr(request, 'resolver_timings', None)
+    if not timings:
+        return
+    slowest = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)[:SLOWEST_FIELDS_REPORTED]
+    report = ', '.join(
+        f'{field_key} (calls={count}, total={total * 1000:.1f}ms, max={max_time * 1000:.1f}ms)'
+        for field_key, (count, total, max_time) in slowest
+    )
+    logger.info(f'Slowest GraphQL fields for operation {operation_name}: {report}')
+    setattr(request, 'resolver_timings', None)
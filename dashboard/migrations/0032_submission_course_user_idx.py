@@ -0,0 +1,17 @@
+# Generated by Django 4.2.29 on 2026-10-18 20:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0031_course_last_accessed_date_backfill'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['course_id', 'user_id'], name='submission_course_user_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.29 on 2026-10-18 20:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0032_submission_course_user_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['course_id'], name='assignment_course_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['assignment_group_id'], name='assignment_group_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assignmentgroups',
+            index=models.Index(fields=['course_id'], name='assignment_groups_course_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resourceaccess',
+            index=models.Index(fields=['course_id', 'access_time'], name='ra_course_access_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['assignment_id'], name='submission_assignment_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['sis_name', 'course_id', 'enrollment_type'], name='user_sis_name_course_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['course_id', 'enrollment_type'], name='user_course_enrollment_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.29 on 2026-10-18 21:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0033_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CronCheckpoint',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False, verbose_name='Table Id')),
+                ('run_start', models.DateTimeField(verbose_name='Run Start DateTime')),
+                ('stage', models.CharField(max_length=100, verbose_name='Stage')),
+                ('chunk', models.CharField(blank=True, default='', max_length=255, verbose_name='Chunk')),
+                ('watermark', models.DateTimeField(blank=True, null=True, verbose_name='Watermark')),
+                ('rows', models.IntegerField(default=0, verbose_name='Rows Written')),
+                ('warehouse_data_date', models.CharField(blank=True, max_length=100, null=True, verbose_name='Warehouse Data Date')),
+                ('completed_at', models.DateTimeField(auto_now_add=True, verbose_name='Completed DateTime')),
+            ],
+            options={
+                'db_table': 'cron_checkpoint',
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.29 on 2026-10-18 21:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0034_cron_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CronStageMetrics',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False, verbose_name='Table Id')),
+                ('run_start', models.DateTimeField(verbose_name='Run Start DateTime')),
+                ('stage', models.CharField(max_length=100, verbose_name='Stage')),
+                ('succeeded', models.BooleanField(default=True, verbose_name='Succeeded')),
+                ('wall_seconds', models.FloatField(verbose_name='Wall Time (seconds)')),
+                ('rows_read', models.BigIntegerField(default=0, verbose_name='Rows Read')),
+                ('rows_written', models.BigIntegerField(default=0, verbose_name='Rows Written')),
+                ('bytes_billed', models.BigIntegerField(default=0, verbose_name='BigQuery Bytes Billed')),
+                ('peak_rss_bytes', models.BigIntegerField(default=0, verbose_name='Peak RSS (bytes)')),
+            ],
+            options={
+                'db_table': 'cron_stage_metrics',
+                'indexes': [models.Index(fields=['run_start'], name='cron_stage_metrics_run_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.29 on 2026-10-18 21:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0035_cron_stage_metrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CronShardLock',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False, verbose_name='Table Id')),
+                ('run_start', models.DateTimeField(verbose_name='Run Start DateTime')),
+                ('shard', models.IntegerField(verbose_name='Shard')),
+                ('course_ids', models.JSONField(verbose_name='Course Ids')),
+                ('warehouse_data_date', models.CharField(blank=True, max_length=100, null=True, verbose_name='Warehouse Data Date')),
+                ('state', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20, verbose_name='State')),
+                ('worker', models.CharField(blank=True, default='', max_length=255, verbose_name='Worker')),
+                ('status', models.TextField(blank=True, default='', verbose_name='Status')),
+                ('resumed_course_run_starts', models.JSONField(default=dict, verbose_name='Resumed Course Run Starts')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated DateTime')),
+            ],
+            options={
+                'db_table': 'cron_shard_lock',
+                'unique_together': {('run_start', 'shard')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.29 on 2026-10-18 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0036_cron_shard_lock'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resourceaccess',
+            name='access_hash',
+            field=models.PositiveBigIntegerField(blank=True, null=True, unique=True, verbose_name='Access Hash'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.29 on 2026-10-18 21:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0037_resource_access_hash'),
+    ]
+
+    operations = [
+        # resource_access.resource_id changes from the VARCHAR resource.resource_id to the integer resource.id.
+        # The integer key is filled into a new column from the existing rows before the VARCHAR column is dropped;
+        # every step has a reverse, so the migration can be rolled back without reloading resource access.
+        migrations.AlterField(
+            model_name='resourceaccess',
+            name='resource_id',
+            field=models.ForeignKey(db_column='resource_id', null=True, on_delete=django.db.models.deletion.CASCADE, to='dashboard.resource', to_field='resource_id'),
+        ),
+        migrations.AddField(
+            model_name='resourceaccess',
+            name='resource_pk',
+            field=models.IntegerField(null=True),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE resource_access a
+                JOIN resource r ON r.resource_id = a.resource_id
+                SET a.resource_pk = r.id;
+            """,
+            reverse_sql="""
+                UPDATE resource_access a
+                JOIN resource r ON r.id = a.resource_pk
+                SET a.resource_id = r.resource_id;
+            """,
+        ),
+        migrations.RemoveField(
+            model_name='resourceaccess',
+            name='resource_id',
+        ),
+        migrations.RenameField(
+            model_name='resourceaccess',
+            old_name='resource_pk',
+            new_name='resource_id',
+        ),
+        migrations.AlterField(
+            model_name='resourceaccess',
+            name='resource_id',
+            field=models.ForeignKey(db_column='resource_id', on_delete=django.db.models.deletion.CASCADE, to='dashboard.resource'),
+        ),
+    ]
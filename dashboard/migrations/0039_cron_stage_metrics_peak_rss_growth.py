@@ -0,0 +1,24 @@
+# Generated by Django 4.2.29 on 2026-10-18 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0038_resource_access_resource_pk'),
+    ]
+
+    operations = [
+        # The stage metrics now record how far each stage raised the process's peak RSS, not the peak itself
+        migrations.RenameField(
+            model_name='cronstagemetrics',
+            old_name='peak_rss_bytes',
+            new_name='peak_rss_growth_bytes',
+        ),
+        migrations.AlterField(
+            model_name='cronstagemetrics',
+            name='peak_rss_growth_bytes',
+            field=models.BigIntegerField(default=0, verbose_name='Peak RSS Growth (bytes)'),
+        ),
+    ]
@@ -9,15 +9,20 @@
 
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Dict, Optional, Union
 
 from zoneinfo import ZoneInfo
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
 from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.urls import reverse
 
+from dashboard.common.json_util import dumps
+
 
 logger = logging.getLogger(__name__)
 
@@ -108,6 +113,10 @@ def __str__(self):
 
     class Meta:
         db_table = 'assignment'
+        indexes = [
+            models.Index(fields=['course_id'], name='assignment_course_idx'),
+            models.Index(fields=['assignment_group_id'], name='assignment_group_idx'),
+        ]
 
 
 class AssignmentGroups(models.Model):
@@ -124,6 +133,9 @@ def __str__(self):
 
     class Meta:
         db_table = 'assignment_groups'
+        indexes = [
+            models.Index(fields=['course_id'], name='assignment_groups_course_idx'),
+        ]
         verbose_name = "Assignment Groups"
         verbose_name_plural = "Assignment Groups"
 
@@ -149,46 +161,17 @@ def get_supported_courses(self) -> QuerySet:
             logger.info("Courses did not exist", exc_info = True)
         return Course.objects.none()
 
-    def earliest_start_datetime(self) -> Optional[datetime]:
-        """Get the earliest start date of courses in the QuerySet
+    def get_data_watermarks(self) -> Dict[int, datetime]:
+        """ Returns the datetime from which each course's data needs to be loaded:
+            the last cron run for the course, or its start date if it has never been loaded.
 
-        :return: Earliest start date of courses in the QuerySet, or None if no course dates found
-        :rtype: datetime
+        :return: Dictionary of course id to datetime
+        :rtype: Dict[int, datetime]
         """
-        sorted_courses = sorted(self.all(), key=lambda course: course.determine_date_start())
-
-        earliest_start = None
-        if len(sorted_courses) > 0:
-            earliest_course = sorted_courses[0]
-            earliest_start = earliest_course.determine_date_start()
-            logger.info(f"Earliest start datetime for CourseQuerySet: {earliest_start.isoformat()} found in course {earliest_course.canvas_id}")
-        else:
-            logger.info(f"No courses in CourseQuerySet; returning None as the earliest_start_datetime")
-        return earliest_start
-
-    def get_data_earliest_date(self) -> Optional[datetime]:
-        """ Returns the datetime of the last cron run of all courses
-            This checks for any courses where the data_last_updated value is null.
-
-            If there are new courses it will return the lower value of the last run date or the earliest start date.
-
-        :return: datetime. Either the earliest or None
-        :rtype: None, datetime
-        """
-        new_courses = self.filter(data_last_updated__isnull=True)
-        existing_courses = self.filter(data_last_updated__isnull=False)
-
-        earliest_data_last_updated = None
-        if len(existing_courses) > 0:
-            earliest_data_last_updated = existing_courses.earliest("data_last_updated").data_last_updated
-
-        earliest_start_datetime = None
-        # If there are new courses (courses with no last run) return the earliest time of all
-        if len(new_courses) > 0:
-            earliest_start_datetime = new_courses.earliest_start_datetime()
-
-        # Return the lower value of existing_earliest and new_earliest, otherwise return None
-        return min(filter(None, (earliest_data_last_updated, earliest_start_datetime)), default=None)
+        return {
+            course.id: course.data_last_updated if course.data_last_updated is not None else course.determine_date_start()
+            for course in self.select_related('term')
+        }
 
 
 class Course(models.Model):
@@ -247,6 +230,30 @@ class Meta:
         verbose_name = "Course"
 
 
+# Cache key of the JSON map of enabled courses, deleted whenever a course or its view options change
+COURSES_ENABLED_CACHE_KEY = 'courses_enabled'
+
+
+class CourseViewOptionManager(models.Manager):
+    def get_courses_enabled_json(self) -> str:
+        """
+        Returns the view options of every course as JSON, keyed by Canvas course id.
+        Built with one query and kept in the cache until invalidate_courses_enabled is called.
+        """
+        courses_enabled_json = cache.get(COURSES_ENABLED_CACHE_KEY)
+        if courses_enabled_json is None:
+            courses_enabled = {}
+            for course_view_option in self.get_queryset().select_related('course'):
+                courses_enabled.update(course_view_option.json())
+            courses_enabled_json = dumps(courses_enabled).decode('utf-8')
+            cache.set(COURSES_ENABLED_CACHE_KEY, courses_enabled_json)
+        return courses_enabled_json
+
+    @staticmethod
+    def invalidate_courses_enabled():
+        cache.delete(COURSES_ENABLED_CACHE_KEY)
+
+
 class CourseViewOption(models.Model):
     course = models.OneToOneField(Course, on_delete=models.CASCADE, primary_key=True, verbose_name="Course View Option Id")
     show_resources_accessed = models.BooleanField(blank=False, null=False, default=True, verbose_name="Show Resources Accessed View")
@@ -255,6 +262,8 @@ class CourseViewOption(models.Model):
 
     VIEWS = ['show_resources_accessed', 'show_assignment_planning', 'show_grade_distribution']
 
+    objects = CourseViewOptionManager()
+
     def __str__(self):
         retval = ""
         if self.show_resources_accessed and 'show_resources_accessed' not in settings.VIEWS_DISABLED: retval += "Resources Accessed\n"
@@ -328,10 +337,13 @@ class Meta:
 
 class ResourceAccess(models.Model):
     id = models.AutoField(primary_key=True, verbose_name="Table Id")
-    resource_id = models.ForeignKey(Resource, on_delete=models.CASCADE, to_field='resource_id', db_column='resource_id')
+    # References the integer resource.id, so the largest table does not repeat the VARCHAR resource ids
+    resource_id = models.ForeignKey(Resource, on_delete=models.CASCADE, db_column='resource_id')
     course_id = models.ForeignKey(Course, null=True, default=None, on_delete=models.CASCADE, db_column='course_id')
     user_id = models.BigIntegerField(blank=True, null=False, verbose_name='User Id')
     access_time = models.DateTimeField(verbose_name="Access Time")
+    # 64-bit hash of (resource_id, user_id, access_time), unique so a replayed load cannot insert an event twice
+    access_hash = models.PositiveBigIntegerField(unique=True, null=True, blank=True, verbose_name="Access Hash")
 
     def __str__(self):
         return f"Resource {self.resource_id} accessed by {self.user_id}"
@@ -340,6 +352,7 @@ class Meta:
         db_table = 'resource_access'
         indexes = [
             models.Index(fields=['user_id'], name='user_id_idx'),
+            models.Index(fields=['course_id', 'access_time'], name='ra_course_access_time_idx'),
         ]
 
 class Submission(models.Model):
@@ -360,6 +373,10 @@ def __str__(self):
 
     class Meta:
         db_table = 'submission'
+        indexes = [
+            models.Index(fields=['course_id', 'user_id'], name='submission_course_user_idx'),
+            models.Index(fields=['assignment_id'], name='submission_assignment_idx'),
+        ]
 
 
 class UnizinMetadata(models.Model):
@@ -370,6 +387,74 @@ class Meta:
         db_table = 'unizin_metadata'
 
 
+class CronCheckpoint(models.Model):
+    id = models.AutoField(primary_key=True, verbose_name="Table Id")
+    run_start = models.DateTimeField(verbose_name="Run Start DateTime")
+    stage = models.CharField(max_length=100, verbose_name="Stage")
+    # Identifies the group of courses a stage (or a chunk of update_resource_access) completed
+    chunk = models.CharField(max_length=255, blank=True, default='', verbose_name="Chunk")
+    watermark = models.DateTimeField(blank=True, null=True, verbose_name="Watermark")
+    rows = models.IntegerField(default=0, verbose_name="Rows Written")
+    warehouse_data_date = models.CharField(max_length=100, blank=True, null=True, verbose_name="Warehouse Data Date")
+    completed_at = models.DateTimeField(auto_now_add=True, verbose_name="Completed DateTime")
+
+    def __str__(self):
+        return f"{self.stage} {self.chunk} completed at {self.completed_at} by run started at {self.run_start}"
+
+    class Meta:
+        db_table = 'cron_checkpoint'
+
+
+class CronShardLock(models.Model):
+    class State(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        RUNNING = 'running', 'Running'
+        DONE = 'done', 'Done'
+        FAILED = 'failed', 'Failed'
+
+    id = models.AutoField(primary_key=True, verbose_name="Table Id")
+    run_start = models.DateTimeField(verbose_name="Run Start DateTime")
+    shard = models.IntegerField(verbose_name="Shard")
+    course_ids = models.JSONField(verbose_name="Course Ids")
+    warehouse_data_date = models.CharField(max_length=100, blank=True, null=True, verbose_name="Warehouse Data Date")
+    state = models.CharField(max_length=20, choices=State.choices, default=State.PENDING, verbose_name="State")
+    worker = models.CharField(max_length=255, blank=True, default='', verbose_name="Worker")
+    status = models.TextField(blank=True, default='', verbose_name="Status")
+    # Courses skipped because an interrupted run already loaded them, with that run's start
+    resumed_course_run_starts = models.JSONField(default=dict, verbose_name="Resumed Course Run Starts")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated DateTime")
+
+    def __str__(self):
+        return f"Shard {self.shard} of run started at {self.run_start}: {self.state}"
+
+    class Meta:
+        db_table = 'cron_shard_lock'
+        unique_together = (('run_start', 'shard'),)
+
+
+class CronStageMetrics(models.Model):
+    id = models.AutoField(primary_key=True, verbose_name="Table Id")
+    run_start = models.DateTimeField(verbose_name="Run Start DateTime")
+    stage = models.CharField(max_length=100, verbose_name="Stage")
+    succeeded = models.BooleanField(default=True, verbose_name="Succeeded")
+    wall_seconds = models.FloatField(verbose_name="Wall Time (seconds)")
+    rows_read = models.BigIntegerField(default=0, verbose_name="Rows Read")
+    rows_written = models.BigIntegerField(default=0, verbose_name="Rows Written")
+    bytes_billed = models.BigIntegerField(default=0, verbose_name="BigQuery Bytes Billed")
+    # How far the stage raised the high-water mark of the cron process's resident memory; 0 when it stayed under
+    # the peak an earlier stage reached
+    peak_rss_growth_bytes = models.BigIntegerField(default=0, verbose_name="Peak RSS Growth (bytes)")
+
+    def __str__(self):
+        return f"{self.stage} of run started at {self.run_start}: {self.wall_seconds:.1f}s"
+
+    class Meta:
+        db_table = 'cron_stage_metrics'
+        indexes = [
+            models.Index(fields=['run_start'], name='cron_stage_metrics_run_idx'),
+        ]
+
+
 class UserQuerySet(models.QuerySet):
     def get_user_in_course(self, user, course):
         return self.get_user_in_course_id(user, course.id)
@@ -406,3 +491,14 @@ def __str__(self):
     class Meta:
         db_table = 'user'
         unique_together = (('id', 'course_id'),)
+        indexes = [
+            models.Index(fields=['sis_name', 'course_id', 'enrollment_type'], name='user_sis_name_course_idx'),
+            models.Index(fields=['course_id', 'enrollment_type'], name='user_course_enrollment_idx'),
+        ]
+
+
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=CourseViewOption)
+def invalidate_courses_enabled_on_change(sender, **kwargs):
+    # QuerySet.update() sends no signal, so callers updating view options that way invalidate the map themselves
+    CourseViewOption.objects.invalidate_courses_enabled()
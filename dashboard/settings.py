@@ -114,6 +114,7 @@ def apply_env_overrides(env: Dict[str, Any], environ: os._Environ) -> Dict[str,
 WATCHMAN_CHECKS = (
     "watchman.checks.caches",
     "watchman.checks.databases",
+    "dashboard.common.db_util.sqlalchemy_pools",
 )
 
 # courses_enabled api
@@ -162,6 +163,7 @@ def apply_env_overrides(env: Dict[str, Any], environ: os._Environ) -> Dict[str,
 # The order of this MIDDLEWARE is important
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'dashboard.middleware.compression.JSONGZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -213,6 +215,34 @@ def apply_env_overrides(env: Dict[str, Any], environ: os._Environ) -> Dict[str,
     'SCHEMA': 'dashboard.graphql.schema.schema'
 }
 
+# Files or directories scanned at startup for GraphQL documents (gql`...` literals or .graphql files)
+# that clients may request by SHA-256 hash instead of sending the full query text
+GRAPHQL_PERSISTED_QUERY_PATHS = ENV.get('GRAPHQL_PERSISTED_QUERY_PATHS', [os.path.join(BASE_DIR, 'assets', 'src')])
+
+# Estimated cost limits checked before a GraphQL operation is executed.
+# Field keys are "TypeName.fieldName"; LIST_SIZES is the expected number of items a list field returns.
+GRAPHQL_QUERY_COST = {
+    **{
+        'MAX_COST': 50000,
+        'DEFAULT_FIELD_COST': 1,
+        'DEFAULT_LIST_SIZE': 10,
+        'FIELD_COSTS': {
+            # These load every submission for the assignment
+            'AssignmentType.averageGrade': 10,
+            'AssignmentType.medianGrade': 10,
+        },
+        'LIST_SIZES': {
+            'CourseType.assignments': 100,
+            'CourseType.assignmentGroups': 20,
+            'AssignmentType.submissions': 1000,
+        },
+    },
+    **ENV.get('GRAPHQL_QUERY_COST', {})
+}
+
+# Log the slowest GraphQL fields for each operation
+GRAPHQL_RESOLVER_TIMING = ENV.get('GRAPHQL_RESOLVER_TIMING', False)
+
 WEBPACK_LOADER = {
     'DEFAULT': {
         'CACHE': not DEBUG,
@@ -241,10 +271,25 @@ def apply_env_overrides(env: Dict[str, Any], environ: os._Environ) -> Dict[str,
             'OPTIONS': {
                 'charset': 'utf8mb4',
             },
+            # Keep ORM connections open between requests, checking them before reuse
+            'CONN_MAX_AGE': 300,
+            'CONN_HEALTH_CHECKS': True,
         },
         **ENV.get('MYSQL', {})
     }
 }
+# Pool of the SQLAlchemy engines the cron loads data with (db_util.get_shared_engine).
+# Connections are recycled after the same age as Django's persistent connections by default.
+DB_POOL = {
+    **{
+        'SIZE': 5,
+        'MAX_OVERFLOW': 10,
+        'TIMEOUT': 30,
+        'RECYCLE': DATABASES['default']['CONN_MAX_AGE'] or -1,
+        'PRE_PING': True,
+    },
+    **ENV.get('DB_POOL', {})
+}
 # optionally set LRS data source
 LRS_IS_BIGQUERY = ENV.get('LRS', {}).get('ENGINE', 'google.cloud.bigquery') == 'google.cloud.bigquery'
 if not LRS_IS_BIGQUERY:
@@ -397,8 +442,34 @@ def apply_env_overrides(env: Dict[str, Any], environ: os._Environ) -> Dict[str,
 MAX_DEFAULT_WEEKS = ENV.get("MAX_DEFAULT_WEEKS", 16)
 
 CLIENT_CACHE_TIME = ENV.get("CLIENT_CACHE_TIME", 3600)
+# JSON responses of at least this many bytes are sent gzip compressed
+JSON_GZIP_MIN_LENGTH = ENV.get("JSON_GZIP_MIN_LENGTH", 1024)
+
+# Serve the application over ASGI (dashboard.asgi with uvicorn workers; start.sh reads this too)
+ASGI = ENV.get("ASGI", False)
+# Threads per ASGI worker running the read-only API views and GraphQL; each can hold a database connection
+ASGI_THREADS = ENV.get("ASGI_THREADS", 8)
 
 CRON_BQ_IN_LIMIT = ENV.get("CRON_BQ_IN_LIMIT", 1000)
+# Rows per chunk when streaming resource access events from a non-BigQuery LRS
+CRON_LRS_CHUNK_SIZE = ENV.get("CRON_LRS_CHUNK_SIZE", 100000)
+# Courses whose last resource access load is within this many hours of each other are loaded with one query
+CRON_WATERMARK_BUCKET_HOURS = ENV.get("CRON_WATERMARK_BUCKET_HOURS", 24)
+
+# Maximum bytes BigQuery may bill in one cron run (checked with a dry run before each query); None for no limit
+CRON_BQ_BYTES_BUDGET = ENV.get("CRON_BQ_BYTES_BUDGET", None)
+# Seconds to keep cron query results that only change with the warehouse snapshot (e.g. course and term data)
+CRON_BQ_CACHE_TTL = ENV.get("CRON_BQ_CACHE_TTL", 86400)
+
+# Skip reloading users, assignments and submissions when the warehouse canvasdatadate has not changed since the last run
+CRON_SKIP_UNCHANGED_WAREHOUSE = ENV.get("CRON_SKIP_UNCHANGED_WAREHOUSE", True)
+
+# How long the sharded cron (manage.py run_sharded_cron) waits for its resource access shards, and how often it checks
+CRON_SHARD_TIMEOUT_SECONDS = ENV.get("CRON_SHARD_TIMEOUT_SECONDS", 4 * 3600)
+CRON_SHARD_POLL_SECONDS = ENV.get("CRON_SHARD_POLL_SECONDS", 5)
+
+# Append cron data with LOAD DATA LOCAL INFILE instead of INSERT statements (requires local_infile=ON in MySQL)
+CRON_BULK_LOAD = ENV.get("CRON_BULK_LOAD", False)
 
 CANVAS_FILE_PREFIX = ENV.get("CANVAS_FILE_PREFIX", "")
 CANVAS_FILE_POSTFIX = ENV.get("CANVAS_FILE_POSTFIX", "")
@@ -0,0 +1,46 @@
+from unittest import mock
+
+import pandas as pd
+from django.test import SimpleTestCase
+
+from dashboard.common.bulk_load import append_dataframe, insert_ignore, load_data_infile
+
+
+class LoadDataInfileTest(SimpleTestCase):
+    df = pd.DataFrame({'access_hash': [1, 2, 3]})
+
+    def load(self, loaded_rows, **kwargs):
+        connection = mock.MagicMock()
+        connection.execute.return_value.rowcount = loaded_rows
+        engine = mock.Mock(begin=mock.Mock(return_value=mock.MagicMock(__enter__=mock.Mock(return_value=connection))))
+        rows = load_data_infile(engine, self.df, 'resource_access', **kwargs)
+        return rows, str(connection.execute.call_args.args[0])
+
+    def test_ignores_duplicates_when_asked(self):
+        rows, sql = self.load(2, ignore_duplicates=True)
+        self.assertEqual(rows, 2)
+        self.assertIn(' IGNORE INTO TABLE `resource_access`', sql)
+
+    def test_fails_on_skipped_rows_by_default(self):
+        rows, sql = self.load(3)
+        self.assertEqual(rows, 3)
+        self.assertNotIn('IGNORE', sql)
+        with self.assertRaises(ValueError):
+            self.load(2)
+
+
+class AppendDataframeTest(SimpleTestCase):
+    def test_to_sql_counts_rows_insert_ignore_wrote(self):
+        df = pd.DataFrame({'access_hash': [1, 2, 3]})
+        engine = mock.Mock()
+        # to_sql returns the sum of what the insert method returns for each chunk
+        with mock.patch.object(pd.DataFrame, 'to_sql', return_value=2) as to_sql:
+            self.assertEqual(append_dataframe(engine, df, 'resource_access', ignore_duplicates=True), 2)
+        self.assertIs(to_sql.call_args.kwargs['method'], insert_ignore)
+
+    def test_insert_ignore_returns_rowcount(self):
+        connection = mock.Mock()
+        connection.execute.return_value.rowcount = 1
+        pd_table = mock.Mock()
+        self.assertEqual(insert_ignore(pd_table, connection, ['access_hash'], iter([(1,), (1,)])), 1)
+        self.assertEqual(connection.execute.call_args.args[1], [{'access_hash': 1}, {'access_hash': 1}])
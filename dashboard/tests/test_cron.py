@@ -0,0 +1,212 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from django.test import SimpleTestCase, override_settings
+
+from dashboard.cron import DashboardCronJob, KnownResource, RESOURCE_ACCESS_DTYPES, SeenAccessHashes
+
+
+class NamedCursor:
+    """Stands in for a psycopg2 named (server-side) cursor, whose description is None until the first fetch"""
+
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+        self.description = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, params):
+        pass
+
+    def fetchmany(self, size):
+        self.description = [(column, None, None, None, None, None, None) for column in self.columns]
+        chunk, self.rows = self.rows[:size], self.rows[size:]
+        return chunk
+
+
+class StreamLrsQueryTest(SimpleTestCase):
+    columns = ['resource_type', 'resource_id', 'user_id', 'user_login_name', 'course_id', 'name', 'access_time']
+    course_id = 17700000000000001
+    rows = [
+        ('canvas', '17700000000000101', 17700000000000123, 'alice', course_id, 'Syllabus', datetime(2026, 9, 1)),
+        ('canvas', '17700000000000102', None, 'bob', course_id, 'Notes', datetime(2026, 9, 2)),
+        ('canvas', '17700000000000101', 17700000000000124, 'carol', course_id, 'Syllabus', datetime(2026, 9, 3)),
+    ]
+
+    @override_settings(CRON_LRS_CHUNK_SIZE=2)
+    def test_streams_chunks_from_named_cursor(self):
+        cursor = NamedCursor(self.columns, list(self.rows))
+        cron_job = SimpleNamespace(rows_read=0)
+        with mock.patch('dashboard.cron.conns', {'LRS': mock.Mock(chunked_cursor=lambda: cursor)}):
+            chunks = list(DashboardCronJob.stream_lrs_query(cron_job, 'select ...', {}))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        self.assertEqual(cron_job.rows_read, 3)
+        self.assertEqual(list(chunks[0].columns), self.columns)
+        self.assertEqual(str(chunks[0]['user_id'].dtype), 'Int64')
+        self.assertEqual(chunks[0]['user_id'].tolist()[0], 17700000000000123)
+        self.assertTrue(chunks[0]['user_id'].isna().tolist()[1])
+
+    def test_empty_result(self):
+        cursor = NamedCursor(self.columns, [])
+        cron_job = SimpleNamespace(rows_read=0)
+        with mock.patch('dashboard.cron.conns', {'LRS': mock.Mock(chunked_cursor=lambda: cursor)}):
+            self.assertEqual(list(DashboardCronJob.stream_lrs_query(cron_job, 'select ...', {})), [])
+
+
+class ArrowResult:
+    """Stands in for a BigQuery RowIterator, which to_arrow reads through the BigQuery Storage API when it can"""
+
+    def __init__(self, arrow_table):
+        self.arrow_table = arrow_table
+
+    def to_arrow(self):
+        return self.arrow_table
+
+
+class BqResultToDataframeTest(SimpleTestCase):
+    arrow_table = pa.table({
+        'resource_id': ['17700000000000101', '17700000000000102', '17700000000000101'],
+        'user_id': pa.array([17700000000000123, None, 17700000000000125], pa.int64()),
+        'course_id': pa.array([17700000000000001] * 3, pa.int64()),
+        'resource_type': ['canvas', 'canvas', 'canvas'],
+        'name': ['Syllabus', 'Notes', 'Syllabus'],
+        'access_time': pa.array([datetime(2026, 9, day, tzinfo=timezone.utc) for day in (1, 2, 3)]),
+        'unused': ['a', 'b', 'c'],
+    })
+
+    def bq_result_to_dataframe(self, *args):
+        cron_job = DashboardCronJob.__new__(DashboardCronJob)
+        cron_job.rows_read = 0
+        df = cron_job.bq_result_to_dataframe(ArrowResult(self.arrow_table), *args)
+        self.assertEqual(cron_job.rows_read, 3)
+        return df
+
+    def test_int64_columns_stay_exact_with_nulls(self):
+        df = self.bq_result_to_dataframe()
+        self.assertEqual(str(df['user_id'].dtype), 'Int64')
+        self.assertEqual(str(df['course_id'].dtype), 'Int64')
+        self.assertEqual(df['user_id'].tolist()[2], 17700000000000125)
+        self.assertTrue(df['user_id'].isna().tolist()[1])
+
+    def test_converts_selected_columns(self):
+        df = self.bq_result_to_dataframe(RESOURCE_ACCESS_DTYPES)
+        self.assertEqual(
+            list(df.columns), ['resource_type', 'resource_id', 'user_id', 'course_id', 'name', 'access_time'])
+        self.assertEqual(str(df['user_id'].dtype), 'Int64')
+        self.assertEqual(str(df['resource_type'].dtype), 'category')
+        self.assertEqual(df['name'].tolist(), ['Syllabus', 'Notes', 'Syllabus'])
+        self.assertEqual(df['resource_id'].tolist()[1], '17700000000000102')
+
+
+class CheckpointKeyTest(SimpleTestCase):
+    def cron_job(self, course_ids, checkpoints):
+        # Skips __init__, which connects to BigQuery
+        cron_job = DashboardCronJob.__new__(DashboardCronJob)
+        cron_job.valid_locked_course_ids = course_ids
+        cron_job.checkpoints = checkpoints
+        cron_job.rows_written = 0
+        cron_job.save_checkpoint = mock.Mock()
+        return cron_job
+
+    def test_stage_runs_again_for_added_courses(self):
+        stage_calls = []
+
+        def update_user():
+            stage_calls.append(1)
+            return 'loaded\n'
+
+        interrupted_run = self.cron_job(['1', '2'], {})
+        interrupted_run.run_stage(update_user)
+        stage, chunk = interrupted_run.save_checkpoint.call_args.args[:2]
+        checkpoint = SimpleNamespace(rows=10, run_start=datetime(2026, 10, 1, tzinfo=timezone.utc))
+
+        self.cron_job(['2', '1'], {(stage, chunk): checkpoint}).run_stage(update_user)
+        self.assertEqual(len(stage_calls), 1)
+        self.cron_job(['1', '2', '3'], {(stage, chunk): checkpoint}).run_stage(update_user)
+        self.assertEqual(len(stage_calls), 2)
+
+    def test_resource_access_chunk_key_depends_on_stored_watermarks(self):
+        watermarks = {'1': datetime(2026, 1, 1, tzinfo=timezone.utc), '2': datetime(2026, 1, 2, tzinfo=timezone.utc)}
+        key = DashboardCronJob.resource_access_chunk_key(watermarks)
+        self.assertEqual(key, DashboardCronJob.resource_access_chunk_key(dict(reversed(watermarks.items()))))
+        self.assertNotEqual(key, DashboardCronJob.resource_access_chunk_key(
+            {**watermarks, '2': watermarks['2'] + timedelta(hours=1)}))
+
+
+class LoadCheckpointsTest(SimpleTestCase):
+    def load_checkpoints(self, **kwargs):
+        cron_job = DashboardCronJob.__new__(DashboardCronJob)
+        cron_job.warehouse_data_date = None
+        with mock.patch('dashboard.cron.CronCheckpoint.objects') as checkpoints:
+            cron_job.load_checkpoints(**kwargs)
+        return checkpoints
+
+    def test_coordinator_prunes_checkpoints(self):
+        self.load_checkpoints().all.return_value.delete.assert_called_once()
+
+    def test_shard_worker_keeps_other_checkpoints(self):
+        self.load_checkpoints(prune=False).all.return_value.delete.assert_not_called()
+
+
+class SyncResourcesTest(SimpleTestCase):
+    def test_matches_ids_by_collation(self):
+        cron_job = DashboardCronJob.__new__(DashboardCronJob)
+        connection = mock.MagicMock()
+        # Another worker already stored this resource with its id in lower case
+        connection.execute.return_value.all.return_value = [('new-page', 7)]
+        cron_job.myla_engine = mock.Mock(begin=mock.Mock(return_value=mock.MagicMock(
+            __enter__=mock.Mock(return_value=connection))))
+        known_resources = {'page': KnownResource(1, 'canvas', 'Page')}
+        resource_df = pd.DataFrame({
+            'resource_id': ['PAGE ', 'page', 'New-Page', 'NEW-PAGE'],
+            'resource_type': ['canvas'] * 4,
+            'name': ['Page', 'Renamed page', 'New page', 'New page'],
+        })
+
+        counts = cron_job.sync_resources(resource_df, known_resources)
+
+        self.assertEqual(tuple(counts), (1, 1, 1))
+        upserted_rows = connection.execute.call_args_list[0].args[1]
+        self.assertEqual([row['resource_id'] for row in upserted_rows], ['page', 'NEW-PAGE'])
+        self.assertEqual(known_resources, {
+            'page': KnownResource(1, 'canvas', 'Renamed page'),
+            'new-page': KnownResource(7, 'canvas', 'New page'),
+        })
+
+
+class SeenAccessHashesTest(SimpleTestCase):
+    def test_keeps_each_hash_once(self):
+        seen_access_hashes = SeenAccessHashes()
+        kept = []
+        for chunk in ([5, 3, 5], [3, 8, 1], [2**64 - 1, 1, 9], [4, 9, 2**64 - 1, 0], [7, 6, 0, 3]):
+            hashes = np.array(chunk, dtype=np.uint64)
+            kept.extend(hashes[seen_access_hashes.keep_new(hashes)].tolist())
+        self.assertEqual(kept, [5, 3, 8, 1, 2**64 - 1, 9, 4, 0, 7, 6])
+        self.assertEqual(sorted(np.concatenate(seen_access_hashes.sorted_arrays).tolist()), sorted(kept))
+        self.assertLess(len(seen_access_hashes.sorted_arrays), 5)
+
+
+class StageMetricsTest(SimpleTestCase):
+    def test_records_peak_rss_growth_of_the_stage(self):
+        cron_job = DashboardCronJob.__new__(DashboardCronJob)
+        cron_job.run_start = datetime(2026, 10, 18, tzinfo=timezone.utc)
+        cron_job.rows_read = cron_job.rows_written = cron_job.total_bytes_billed = 0
+        # ru_maxrss (in kilobytes) before and after the stage
+        rusages = [SimpleNamespace(ru_maxrss=500_000), SimpleNamespace(ru_maxrss=500_256)]
+        with mock.patch('dashboard.cron.resource.getrusage', side_effect=rusages), \
+                mock.patch('dashboard.cron.CronStageMetrics.save', autospec=True) as save:
+            with cron_job.stage_metrics('update_user'):
+                cron_job.rows_read = 3
+        metrics = save.call_args.args[0]
+        self.assertEqual((metrics.stage, metrics.succeeded, metrics.rows_read), ('update_user', True, 3))
+        self.assertEqual(metrics.peak_rss_growth_bytes, 256 * 1024)
@@ -0,0 +1,26 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+from sqlalchemy import create_engine, text
+
+from dashboard.common import db_util
+from dashboard.common.metered_pool import MeteredQueuePool
+
+
+class PoolMetricsStatusTest(SimpleTestCase):
+    def test_reports_shared_engine_checkouts(self):
+        engine = create_engine('sqlite://', poolclass=MeteredQueuePool, pool_size=2)
+        with mock.patch.dict(db_util.shared_engines, {'bulk_load': engine}, clear=True):
+            for _ in range(3):
+                with engine.connect() as connection:
+                    connection.execute(text('select 1'))
+            status = db_util.pool_metrics_status()
+        self.assertTrue(status.startswith('Connection pool bulk_load: size 2, 0 checked out, 0 overflow, 3 checkouts'))
+
+    def test_watchman_check_reports_shared_engines(self):
+        engine = create_engine('sqlite://', poolclass=MeteredQueuePool, pool_size=2)
+        with mock.patch.dict(db_util.shared_engines, {'default': engine}, clear=True):
+            with engine.connect():
+                check = db_util.sqlalchemy_pools()
+        self.assertEqual(check['sqlalchemy_pools'][0]['default']['ok'], True)
+        self.assertEqual(check['sqlalchemy_pools'][0]['default']['checked_out'], 1)
@@ -0,0 +1,56 @@
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+from graphene_django.views import GraphQLView, HttpError
+from graphql import parse
+
+from dashboard.graphql.persisted_queries import hash_query
+from dashboard.graphql.view import DashboardGraphQLView, persisted_query_registry
+
+
+class PersistedQueryParamsTest(SimpleTestCase):
+    def get_graphql_params(self, data):
+        return DashboardGraphQLView().get_graphql_params(RequestFactory().post('/graphql'), data)
+
+    @staticmethod
+    def persisted_query(query_hash):
+        return {'extensions': {'persistedQuery': {'version': 1, 'sha256Hash': query_hash}}}
+
+    def test_registered_hash_is_swapped_for_its_query(self):
+        query_hash, query = next(iter(persisted_query_registry.queries.items()))
+        params_query, *_ = self.get_graphql_params({**self.persisted_query(query_hash), 'variables': {'courseId': 1}})
+        self.assertEqual(params_query, query)
+
+    def test_unknown_hash_asks_for_the_query(self):
+        with self.assertRaisesMessage(HttpError, 'PersistedQueryNotFound'):
+            self.get_graphql_params(self.persisted_query(hash_query('{ unknown }')))
+
+    def test_unregistered_query_is_kept(self):
+        query = 'query Unregistered { __typename }'
+        params_query, *_ = self.get_graphql_params({**self.persisted_query(hash_query(query)), 'query': query})
+        self.assertEqual(params_query, query)
+
+
+class PersistedQueryExecutionTest(SimpleTestCase):
+    def execute_graphql_request(self, query):
+        request = RequestFactory().post('/graphql')
+        with mock.patch.object(DashboardGraphQLView, 'execute_persisted_document') as execute_persisted_document, \
+                mock.patch.object(GraphQLView, 'execute_graphql_request') as execute_graphql_request:
+            DashboardGraphQLView().execute_graphql_request(request, {}, query, {}, None)
+        return execute_persisted_document, execute_graphql_request
+
+    def test_registered_query_runs_its_parsed_document(self):
+        query_hash, query = next(iter(persisted_query_registry.queries.items()))
+        execute_persisted_document, execute_graphql_request = self.execute_graphql_request(query)
+        self.assertIs(execute_persisted_document.call_args.args[1], persisted_query_registry.documents[query_hash])
+        execute_graphql_request.assert_not_called()
+
+    def test_unregistered_query_is_parsed_and_validated(self):
+        execute_persisted_document, execute_graphql_request = self.execute_graphql_request('{ __typename }')
+        execute_persisted_document.assert_not_called()
+        execute_graphql_request.assert_called_once()
+
+    def test_mutation_is_not_run_from_get(self):
+        document = parse('mutation M { __typename }')
+        with self.assertRaisesMessage(HttpError, 'Can only perform a mutation operation from a POST request.'):
+            DashboardGraphQLView().execute_persisted_document(RequestFactory().get('/graphql'), document, {}, None)
@@ -0,0 +1,25 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase, tag
+
+from dashboard.management.commands.check_query_plans import explain_hot_queries
+
+IS_MYSQL = connection.vendor == 'mysql'
+
+
+@tag('mysql')
+@skipUnless(IS_MYSQL, 'EXPLAIN output is MySQL specific')
+class HotQueryPlansTest(TestCase):
+    # No test database is needed (or created) for other backends
+    databases = {'default'} if IS_MYSQL else set()
+
+    def test_no_full_table_scans(self):
+        with connection.cursor() as cursor:
+            # The test tables are empty, where a scan would otherwise cost the same as an index lookup. Telling the
+            # optimizer no key lookup takes more than 1000 seeks makes it use any index that applies, so a scan
+            # that remains means the query has no usable index.
+            cursor.execute('SET SESSION max_seeks_for_key = 1000')
+            plans = list(explain_hot_queries(cursor))
+        full_scans = [f"{name} ({plan['table']})" for name, plan in plans if plan.get('type') == 'ALL']
+        self.assertEqual(full_scans, [])
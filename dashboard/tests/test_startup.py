@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+
+from django.test import SimpleTestCase
+
+# Libraries only the cron needs; a web worker should not import any of them at startup
+CRON_ONLY_MODULES = ('google.cloud.bigquery', 'pandas', 'pangres', 'pyarrow', 'numpy', 'sqlalchemy')
+
+# Seconds a web worker may spend importing Django, the settings, dashboard.wsgi and the URLconf, as reported by
+# -X importtime (which adds some overhead of its own); about 0.6s when this was written
+STARTUP_IMPORT_BUDGET_SECONDS = float(os.getenv('STARTUP_IMPORT_BUDGET_SECONDS', '2'))
+
+STARTUP_SCRIPT = 'import django; django.setup(); import dashboard.wsgi; import dashboard.urls'
+
+
+class WorkerStartupImportsTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # A fresh interpreter, so modules the test runner already imported do not hide what a web worker loads
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT], check=True, capture_output=True, text=True,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'dashboard.settings'}
+        )
+        # importtime writes "import time: <self us> | <cumulative us> | <module name>" lines to stderr,
+        # with the name indented by two spaces per level of nesting
+        cls.cumulative_us = {}
+        cls.top_level_us = 0
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or line.endswith('imported package'):
+                continue
+            _self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            if not cumulative_us.strip().isdigit():
+                continue
+            cls.cumulative_us[name.strip()] = int(cumulative_us)
+            if not name[1:].startswith(' '):
+                cls.top_level_us += int(cumulative_us)
+
+    def test_no_cron_only_modules(self):
+        self.assertIn('dashboard.urls', self.cumulative_us)
+        cron_only_imports = sorted(
+            name for name in self.cumulative_us
+            if any(name == module or name.startswith(f'{module}.') for module in CRON_ONLY_MODULES)
+        )
+        self.assertEqual(cron_only_imports, [])
+
+    def test_import_time_within_budget(self):
+        slowest = sorted(self.cumulative_us.items(), key=lambda item: item[1], reverse=True)[:10]
+        self.assertLessEqual(
+            self.top_level_us / 1e6, STARTUP_IMPORT_BUDGET_SECONDS,
+            f'Startup imports took {self.top_level_us / 1e6:.2f}s; slowest (cumulative us): {slowest}'
+        )
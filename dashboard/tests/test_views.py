@@ -0,0 +1,109 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.contrib.auth.models import User as DjangoUser
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from dashboard import views
+from dashboard.models import Course, CourseViewOption
+
+
+class CourseTestCase(SimpleTestCase):
+    def setUp(self):
+        # Starts at local midnight in Detroit, 04:00 UTC
+        self.course = Course(id=17700000000000123, canvas_id=123, name='Course',
+                             date_start=datetime(2026, 9, 1, 4, tzinfo=timezone.utc),
+                             data_last_updated=datetime(2026, 10, 1, tzinfo=timezone.utc))
+        # As select_related would have loaded it
+        self.course._state.fields_cache['courseviewoption'] = CourseViewOption(course=self.course)
+        queryset = mock.MagicMock()
+        queryset.filter.return_value.first.return_value = self.course
+        patcher = mock.patch.object(Course.objects, 'select_related', return_value=queryset)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, view, params=None, etag=None, username='alice'):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        request = RequestFactory().get('/', params or {}, **headers)
+        request.user = DjangoUser(username=username)
+        return view(request, course_id=123)
+
+
+class CourseDataConditionalTest(CourseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.view_calls = 0
+
+    def view(self, request, course_id=0):
+        self.view_calls += 1
+        return HttpResponse('{}', content_type='application/json')
+
+    def test_not_modified_until_inputs_change(self):
+        view = views.course_data_conditional()(self.view)
+        response = self.get(view, {'grade': 'all'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+        self.assertFalse(response.has_header('Last-Modified'))
+        etag = response['ETag']
+
+        self.assertEqual(self.get(view, {'grade': 'all'}, etag).status_code, 304)
+        self.assertEqual(self.view_calls, 1)
+        self.assertEqual(self.get(view, {'grade': '90-100'}, etag).status_code, 200)
+        self.assertEqual(self.get(view, {'grade': 'all'}, etag, username='bob').status_code, 200)
+        self.course.data_last_updated = datetime(2026, 10, 2, tzinfo=timezone.utc)
+        self.assertEqual(self.get(view, {'grade': 'all'}, etag).status_code, 200)
+
+    def test_current_week_changes_etag_at_course_start_time(self):
+        view = views.course_data_conditional(current_week=True)(self.view)
+        # Same UTC day, before and after the start of the course's fifth week
+        with mock.patch('django.utils.timezone.now', return_value=datetime(2026, 9, 30, 2, tzinfo=timezone.utc)):
+            etag = self.get(view)['ETag']
+        with mock.patch('django.utils.timezone.now', return_value=datetime(2026, 9, 30, 3, tzinfo=timezone.utc)):
+            self.assertEqual(self.get(view, etag=etag).status_code, 304)
+        with mock.patch('django.utils.timezone.now', return_value=datetime(2026, 9, 30, 5, tzinfo=timezone.utc)):
+            self.assertEqual(self.get(view, etag=etag).status_code, 200)
+
+
+class CourseInfoLastAccessedTest(CourseTestCase):
+    def get_course_info(self, etag=None):
+        # Skips the permission check
+        with mock.patch.object(Course.objects, 'get', return_value=self.course), \
+                mock.patch.object(Course.objects, 'filter') as course_filter, \
+                mock.patch.object(Course, 'save') as save, \
+                mock.patch('dashboard.views.Resource.objects.get_course_resource_type', return_value=[]), \
+                mock.patch('dashboard.views.get_course_view_options', return_value={}):
+            response = self.get(views.get_course_info.__wrapped__, etag=etag)
+        save.assert_not_called()
+        course_filter.assert_called_once_with(id=self.course.id)
+        course_filter.return_value.update.assert_called_once_with(last_accessed_date=mock.ANY)
+        return response
+
+    def test_updates_last_accessed_date(self):
+        self.assertEqual(self.get_course_info().status_code, 200)
+
+    def test_not_modified_updates_last_accessed_date(self):
+        etag = self.get_course_info()['ETag']
+        self.assertEqual(self.get_course_info(etag).status_code, 304)
+
+
+class ResourceGradePercentsTest(SimpleTestCase):
+    def test_missing_grades_count_as_low_grade(self):
+        access_rows = [
+            (1, 'canvas', 'Syllabus', views.GRADE_A, 1),
+            (1, 'canvas', 'Syllabus', views.GRADE_LOW, 1),
+            (1, 'canvas', 'Syllabus', views.NO_GRADE_STRING, 2),
+            (2, 'leccap', 'Lecture 1', views.GRADE_B, 1),
+        ]
+        resources = views.resource_grade_percents(access_rows, ['canvas'], 4)
+        self.assertEqual(list(resources), [(1, 'canvas')])
+        self.assertEqual(resources[(1, 'canvas')]['percents'], {
+            views.GRADE_A: 0.25, views.GRADE_B: 0.0, views.GRADE_C: 0.0, views.GRADE_LOW: 0.75,
+            views.NO_GRADE_STRING: 0.0,
+        })
+
+    def test_no_grades_at_all_count_as_no_grade(self):
+        access_rows = [(1, 'canvas', 'Syllabus', views.NO_GRADE_STRING, 2)]
+        percents = views.resource_grade_percents(access_rows, ['canvas'], 4)[(1, 'canvas')]['percents']
+        self.assertEqual(percents[views.NO_GRADE_STRING], 0.5)
+        self.assertEqual(percents[views.GRADE_LOW], 0.0)
@@ -23,19 +23,26 @@
 from django.urls import include
 from django.urls import path, re_path
 
+from dashboard.common.async_views import threaded_async_view
 from dashboard.graphql.view import DashboardGraphQLView
 
-from django.views.decorators.cache import cache_page
-
 from dashboard.middleware.disableintrospection import DisableIntrospectionMiddleware
+from dashboard.middleware.resolvertiming import ResolverTimingMiddleware
 
 from . import views
 
 import watchman.views
 
+graphql_middleware = [] if settings.DEBUG else [DisableIntrospectionMiddleware]
+if settings.GRAPHQL_RESOLVER_TIMING:
+    graphql_middleware.append(ResolverTimingMiddleware)
+
 # Disable the Django admin login page
 admin.site.login = staff_member_required(admin.site.login, login_url=settings.LOGIN_URL)
 
+# Over ASGI, the read-only API views and GraphQL run concurrently in a thread pool (see dashboard.common.async_views)
+read_only_view = threaded_async_view if settings.ASGI else (lambda view: view)
+
 urlpatterns = [
     path('', views.get_home_template, name = 'home'),
     path('status/', include('watchman.urls')),
@@ -44,7 +51,8 @@
     path('admin/', admin.site.urls),
 
     # Note the absence of a trailing slash; adding one breaks the GraphQL implementation.
-    path('graphql', DashboardGraphQLView.as_view( middleware=[] if settings.DEBUG else [DisableIntrospectionMiddleware],graphiql=settings.DEBUG)),
+    path('graphql', read_only_view(
+        DashboardGraphQLView.as_view(middleware=graphql_middleware, graphiql=settings.DEBUG))),
 
     # This is the courses catch-all. Most user-initiated requests will match the regular expression; then the React
     # front-end will manage any additional routing.
@@ -55,16 +63,16 @@
     # These URLs are data patterns
     # GET access patterns
     path('api/v1/courses/<int:course_id>/grade_distribution/',
-        login_required(views.grade_distribution), name='grade_distribution'),
+        read_only_view(login_required(views.grade_distribution)), name='grade_distribution'),
     path('api/v1/courses/<int:course_id>/resource_access_within_week/',
-        login_required(views.resource_access_within_week), name='resource_access_within_week'),
+        read_only_view(login_required(views.resource_access_within_week)), name='resource_access_within_week'),
     path('api/v1/courses/<int:course_id>/get_user_default_selection/',
-        login_required(views.get_user_default_selection), name='get_user_default_selection'),
+        read_only_view(login_required(views.get_user_default_selection)), name='get_user_default_selection'),
     path('api/v1/courses/<int:course_id>/info/',
-        login_required(views.get_course_info), name='get_course_info'),
+        read_only_view(login_required(views.get_course_info)), name='get_course_info'),
     # This is a public view of the courses we have enabled
     path('api/v1/courses_enabled/',
-        cache_page(settings.CLIENT_CACHE_TIME)(views.courses_enabled), name='courses_enabled'),
+        read_only_view(views.courses_enabled), name='courses_enabled'),
 
 
     # PUT/POST access patterns
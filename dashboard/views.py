@@ -1,12 +1,14 @@
+import functools
+import hashlib
 import json
 import logging
 import math
+import statistics
 from collections import namedtuple
 from datetime import timedelta, datetime
 from json import JSONDecodeError
 
 import jsonschema
-import pandas as pd
 from constance import config
 from django.conf import settings
 from django.contrib import auth
@@ -15,11 +17,14 @@
 from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
 from django.shortcuts import redirect, render
 from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_response_headers
+from django.views.decorators.http import condition
 from pinax.eventlog.models import log as eventlog
 from rules.contrib.views import permission_required, objectgetter
 
 from dashboard.common import utils
-from dashboard.common.db_util import canvas_id_to_incremented_id, create_sqlalchemy_engine
+from dashboard.common.db_util import canvas_id_to_incremented_id, fetch_all, fetch_value
+from dashboard.common.json_util import json_response
 from dashboard.event_logs_types.event_logs_types import EventLogTypes
 from dashboard.models import Course, CourseViewOption, Resource, UserDefaultSelection
 from dashboard.settings import COURSES_ENABLED, RESOURCE_VALUES, RESOURCE_VALUES_MAP, \
@@ -43,22 +48,20 @@
 
 BinningGrade = namedtuple('BinningGrade', ['value', 'index', 'binning_all'])
 
-app_engine = create_sqlalchemy_engine(settings.DATABASES['default'])
 
+GRADES = [GRADE_A, GRADE_B, GRADE_C, GRADE_LOW, NO_GRADE_STRING]
+# map a user's current grade to its grade range, in SQL so resource access can be counted per range by MySQL
+GRADE_RANGE_SQL = f"""CASE WHEN u.current_grade IS NULL THEN '{NO_GRADE_STRING}'
+                    WHEN u.current_grade >= 90 THEN '{GRADE_A}'
+                    WHEN u.current_grade >= 80 THEN '{GRADE_B}'
+                    WHEN u.current_grade >= 70 THEN '{GRADE_C}'
+                    ELSE '{GRADE_LOW}' END"""
 
-def gpa_map(grade):
-    if grade is None:
-        return NO_GRADE_STRING
-    # convert to float
-    grade_float = float(grade)
-    if grade_float >= 90:
-        return GRADE_A
-    elif grade_float >=80:
-        return GRADE_B
-    elif grade_float >=70:
-        return GRADE_C
-    else:
-        return GRADE_LOW
+# access times are naive UTC datetimes
+EPOCH = datetime(1970, 1, 1)
+
+# deployed version, so browsers do not reuse responses cached before an upgrade that changed them
+RESPONSE_VERSION = (utils.get_git_version_info() or {}).get('commit', '')
 
 
 def get_home_template(request):
@@ -73,6 +76,71 @@ def view_names_mapping():
     return view_column_names
 
 
+def get_current_week_number(course, now):
+    return math.ceil((now - course.determine_date_start()).days/7)
+
+
+def course_data_etag(request, course_id, current_week=False):
+    """
+    Returns the ETag of a course data response, or None if the course does not exist.
+    The course data only changes when the cron loads it and sets data_last_updated, so the ETag combines the course
+    (including data_last_updated) and its view options, which admins and instructors can edit, with the user,
+    the request parameters, the deployed version and the globally disabled views.
+    With current_week, it also changes when the course's current week number does.
+    """
+    course = Course.objects.select_related('term', 'courseviewoption') \
+        .filter(id=canvas_id_to_incremented_id(course_id)).first()
+    if course is None:
+        return None
+    course_view_option = getattr(course, 'courseviewoption', None)
+
+    etag_parts = [
+        RESPONSE_VERSION,
+        settings.VIEWS_DISABLED,
+        request.user.get_username(),
+        request.user.is_staff,
+        sorted(request.GET.lists()),
+        model_to_dict(course, exclude=['last_accessed_date']),
+        model_to_dict(course.term) if course.term else None,
+        model_to_dict(course_view_option) if course_view_option else None,
+    ]
+    if current_week:
+        etag_parts.append(get_current_week_number(course, timezone.now()))
+    return hashlib.sha256(json.dumps(etag_parts, default=str).encode('utf-8')).hexdigest()
+
+
+def course_data_conditional(current_week=False):
+    """
+    Answers a conditional GET of a course data view with 304 Not Modified while its course_data_etag is unchanged,
+    without running the view or its queries. Responses are private and revalidated on every use.
+    There is no Last-Modified: data_last_updated can move back when an interrupted cron run is resumed.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def conditional_view(request, course_id=0):
+            etag = course_data_etag(request, course_id, current_week)
+            if etag is None:
+                return view(request, course_id=course_id)
+            response = condition(etag_func=lambda *args, **kwargs: etag)(view)(request, course_id=course_id)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return conditional_view
+    return decorator
+
+
+def record_course_access(view):
+    """
+    Saves the time of each request to a course view as the course's last_accessed_date, including requests
+    course_data_conditional answers with 304 Not Modified. update() is used rather than save() so the
+    courses_enabled map, invalidated when a course is saved, is kept.
+    """
+    @functools.wraps(view)
+    def access_recording_view(request, course_id=0):
+        Course.objects.filter(id=canvas_id_to_incremented_id(course_id)).update(last_accessed_date=datetime.now())
+        return view(request, course_id=course_id)
+    return access_recording_view
+
+
 def get_course_view_options(is_admin, course):
     view_column_names: dict = view_names_mapping()
     global_views_disabled = []
@@ -87,6 +155,8 @@ def get_course_view_options(is_admin, course):
 
 @permission_required('dashboard.get_course_info',
     fn=objectgetter(Course, 'course_id', 'canvas_id'), raise_exception=True)
+@record_course_access
+@course_data_conditional(current_week=True)
 def get_course_info(request, course_id=0):
     """Returns JSON data about a course
 
@@ -102,9 +172,6 @@ def get_course_info(request, course_id=0):
 
     try:
         course = Course.objects.get(id=course_id)
-        # save the timestamp as the course last_accessed_date
-        course.last_accessed_date = datetime.now()
-        course.save()
     except ObjectDoesNotExist:
         return HttpResponse("{}")
 
@@ -141,7 +208,7 @@ def get_course_info(request, course_id=0):
     course_start = course.determine_date_start()
     course_end = course.determine_date_end(course_start)
 
-    current_week_number = math.ceil((today - course_start).days/7)
+    current_week_number = get_current_week_number(course, today)
     total_weeks = math.ceil((course_end - course_start).days/7)
 
     if course.term is not None:
@@ -159,7 +226,7 @@ def get_course_info(request, course_id=0):
     resp['resource_types'] = course_resource_list
     resp['course_data_loaded'] = 1 if course.term_id else 0
 
-    return HttpResponse(json.dumps(resp, default=str))
+    return json_response(resp, default=str)
 
 
 @permission_required('dashboard.update_course_info',
@@ -228,6 +295,7 @@ def update_course_info(request, course_id=0):
                     show_grade_counts=view_settings['show_grade_counts'])
 
         CourseViewOption.objects.filter(pk=course_id).update(**view_data)
+        CourseViewOption.objects.invalidate_courses_enabled()
     except (ObjectDoesNotExist, Exception) as e:
         logger.info(
             f'updating course visualization options failed due to {e} for user {current_user} in course {course_id}')
@@ -240,6 +308,7 @@ def update_course_info(request, course_id=0):
 # show percentage of users who read the resource within prior n weeks
 @permission_required('dashboard.resource_access_within_week',
     fn=objectgetter(Course, 'course_id','canvas_id'), raise_exception=True)
+@course_data_conditional()
 def resource_access_within_week(request, course_id=0):
 
     course_id = canvas_id_to_incremented_id(course_id)
@@ -248,9 +317,6 @@ def resource_access_within_week(request, course_id=0):
 
     logger.debug("current_user=" + current_user)
 
-    # environment settings:
-    df_default_display_settings()
-
     # read quefrom request param
     week_num_start = int(request.GET.get('week_num_start','1'))
     week_num_end = int(request.GET.get('week_num_end','1'))
@@ -283,11 +349,10 @@ def resource_access_within_week(request, course_id=0):
     elif (grade == GRADE_C):
         total_number_student_sql += " and current_grade >= 70 and current_grade < 80"
 
-    total_number_student_df = pd.read_sql(total_number_student_sql, app_engine, params={
+    total_number_student = fetch_value(total_number_student_sql, {
         "course_id": course_id,
         "enrollment_type": "StudentEnrollment"
         })
-    total_number_student = total_number_student_df.iloc[0,0]
     logger.debug(f"course_id {course_id} total student={total_number_student}")
     if total_number_student == 0:
         logger.info(f"There are no students in the percent grade range {grade} for course {course_id}")
@@ -300,141 +365,108 @@ def resource_access_within_week(request, course_id=0):
     logger.debug("course_start=" + str(course_date_start) + " start=" + str(start) + " end=" + str(end))
 
     # get time range based on week number passed in via request
-
-    sqlString = f"""SELECT a.resource_id as resource_id,
+    # count the students who accessed each resource, per grade range
+    sqlString = f"""SELECT r.resource_id as resource_id,
                     r.resource_type as resource_type,
-                    CONCAT(r.resource_id, r.resource_type) as resource_id_type,
                     r.name as name,
-                    u.current_grade as current_grade,
-                    a.user_id as user_id
+                    {GRADE_RANGE_SQL} as grade,
+                    count(distinct a.user_id) as student_count
                     FROM resource r, resource_access a, user u, course c, academic_terms t
-                    WHERE a.resource_id = r.resource_id and a.user_id = u.user_id
+                    WHERE a.resource_id = r.id and a.user_id = u.user_id
                     and a.course_id = c.id and c.term_id = t.id
                     and a.access_time > %(start_time)s
                     and a.access_time < %(end_time)s
                     and a.course_id = %(course_id)s
                     and u.course_id = %(course_id)s
                     and u.enrollment_type = %(enrollment_type)s
+                    group by r.id, grade
                 """
 
     startTimeString = start.strftime('%Y%m%d') + "000000"
     endTimeString = end.strftime('%Y%m%d') + "000000"
     logger.debug(sqlString)
     logger.debug("start time=" + startTimeString + " end_time=" + endTimeString)
-    df = pd.read_sql(sqlString, app_engine, params={
+    access_rows = fetch_all(sqlString, {
             "start_time": startTimeString,
             "end_time": endTimeString,
             "course_id": course_id,
             "enrollment_type": 'StudentEnrollment'
         })
-    logger.debug(df)
+    logger.debug(access_rows)
     # return if there is no data during this interval
-    if (df.empty):
+    if not access_rows:
         return HttpResponse("{}")
 
-    df.set_index(['resource_id_type'])
-    # drop resource records when the resource has been accessed multiple times by one user
-    df.drop_duplicates(inplace=True)
-
-    # map point grade to letter grade
-    df['grade'] = df['current_grade'].map(gpa_map)
-
-    # calculate the percentage
-    df['percent'] = df.groupby(['resource_id_type', 'grade'])['resource_id_type'].transform('count') / total_number_student
-
-    df=df.drop(['current_grade', 'user_id'], axis=1)
-    # now only keep the resource access stats by grade level
-    df.drop_duplicates(inplace=True)
-
+    resources = resource_grade_percents(access_rows, filter_list, total_number_student)
 
-    resource_id_type=df["resource_id_type"].unique()
-
-    #df.reset_index(inplace=True)
-
-    # zero filled dataframe with resource name as row name, and grade as column name
-    output_df=pd.DataFrame(0.0, index=resource_id_type, columns=['r_id', 'r_name', GRADE_A, GRADE_B, GRADE_C, GRADE_LOW, NO_GRADE_STRING, RESOURCE_TYPE_STRING])
-    output_df=output_df.rename_axis('resource_id_type')
-    output_df=output_df.astype({RESOURCE_TYPE_STRING: str})
-    output_df=output_df.astype({'r_name': str})
-    output_df=output_df.astype({'r_id': str})
-
-
-    for index, row in df.iterrows():
-        # set value
-        output_df.at[row['resource_id_type'], row['grade']] = row['percent']
-        output_df.at[row['resource_id_type'], RESOURCE_TYPE_STRING] = row[RESOURCE_TYPE_STRING]
-        output_df.at[row['resource_id_type'], 'r_name'] = row['name']
-        output_df.at[row['resource_id_type'], 'r_id'] = row['resource_id']
-    output_df.reset_index(inplace=True)
+    # if no checkboxes are checked send nothing
+    if not resources:
+        return HttpResponse("{}")
 
     # now insert person's own viewing records: what resources the user has viewed, and the last access timestamp
     selfSqlString = f"""
                     select
                     r.resource_id as resource_id,
-                    CONCAT(r.resource_id, r.resource_type) as resource_id_type,
-                    r.name as name,
+                    r.resource_type as resource_type,
                     count(*) as self_access_count,
                     max(a.access_time) as self_access_last_time
                     from resource_access a, user u, resource r
                     where a.user_id = u.user_id
-                    and a.resource_id = r.resource_id
+                    and a.resource_id = r.id
                     and u.sis_name=%(current_user)s
                     and a.course_id = %(course_id)s
                     and a.course_id = u.course_id
-                    group by r.resource_id, r.resource_type, r.name"""
+                    group by r.id"""
     logger.debug(selfSqlString)
     logger.debug("current_user=" + current_user)
 
-    selfDf= pd.read_sql(selfSqlString, app_engine, params={"current_user":current_user, "course_id": course_id})
-    output_df = output_df.join(selfDf.set_index('resource_id_type'), on=['resource_id_type'], how='left')
-    output_df["total_percent"] = output_df.apply(lambda row: row[GRADE_A] + row[GRADE_B] + row[GRADE_C] + row[GRADE_LOW] + row.NO_GRADE, axis=1)
-
-    if (grade != "all"):
-        # drop all other grades
-        grades = [GRADE_A, GRADE_B, GRADE_C, GRADE_LOW, NO_GRADE_STRING]
-        for i_grade in grades:
-            if (i_grade==grade):
-                output_df["total_percent"] = output_df[i_grade]
-            else:
-                output_df=output_df.drop([i_grade], axis=1)
-    
-    output_df=output_df[output_df.resource_type.isin(filter_list)]
-
-    # if no checkboxes are checked send nothing
-    if (output_df.empty):
-        return HttpResponse("{}")
-
-    # only keep rows where total_percent > 0
-    output_df = output_df[output_df.total_percent > 0]
-
-    # time 100 to show the percentage
-    output_df["total_percent"] *= 100
-    # round all numbers to whole numbers
-    output_df = output_df.round(0)
-
-    output_df.fillna(0, inplace=True) #replace null value with 0
+    self_access = {
+        (resource_id, resource_type): (resource_id, self_access_count, self_access_last_time)
+        for resource_id, resource_type, self_access_count, self_access_last_time
+        in fetch_all(selfSqlString, {"current_user": current_user, "course_id": course_id})
+    }
 
-    output_df['resource_name'] = output_df.apply(
-        lambda row:
-            (RESOURCE_ACCESS_CONFIG.get(row.resource_type).get("urls").get("prefix") +
-            str(row.r_id) +
-            RESOURCE_ACCESS_CONFIG.get(row.resource_type).get("urls").get("postfix") +
-            CANVAS_FILE_ID_NAME_SEPARATOR +
-            str(row.r_name) + CANVAS_FILE_ID_NAME_SEPARATOR +
-            RESOURCE_VALUES.get(RESOURCE_VALUES_MAP.get(row.resource_type)).get('icon')
+    # a single grade range shows only that range's column; its total is that range's percentage
+    shown_grades = GRADES if grade == "all" else [i_grade for i_grade in GRADES if i_grade == grade]
+    output = []
+    for (resource_id, resource_type), resource in resources.items():
+        percents = resource['percents']
+        total_percent = percents[grade] if grade in GRADES else sum(percents[i_grade] for i_grade in GRADES)
+        # only keep rows where total_percent > 0
+        if total_percent <= 0:
+            continue
+        self_resource_id, self_access_count, self_access_last_time = self_access.get((resource_id, resource_type), (0, 0, None))
+
+        # round all numbers to whole numbers, with time 100 to show the percentage
+        row = {'r_id': resource_id, 'r_name': resource['name']}
+        row.update({i_grade: round(percents[i_grade], 0) for i_grade in shown_grades})
+        row.update({
+            # RESOURCE_VALUES_MAP {'canvas': 'files', 'leccap': 'videos', 'mivideo': 'videos'}
+            'resource_type': RESOURCE_VALUES_MAP.get(resource_type, resource_type),
+            'resource_id': self_resource_id,
+            'self_access_count': self_access_count,
+            # milliseconds since the epoch, as the frontend expects
+            'self_access_last_time': (self_access_last_time - EPOCH) // timedelta(milliseconds=1)
+                if self_access_last_time is not None else 0,
+            'total_percent': round(total_percent * 100, 0),
+            'resource_name': (
+                RESOURCE_ACCESS_CONFIG.get(resource_type).get("urls").get("prefix") +
+                str(resource_id) +
+                RESOURCE_ACCESS_CONFIG.get(resource_type).get("urls").get("postfix") +
+                CANVAS_FILE_ID_NAME_SEPARATOR +
+                str(resource['name']) + CANVAS_FILE_ID_NAME_SEPARATOR +
+                RESOURCE_VALUES.get(RESOURCE_VALUES_MAP.get(resource_type)).get('icon')
             ),
-        axis=1)
-    # RESOURCE_VALUES_MAP {'canvas': 'files', 'leccap': 'videos', 'mivideo': 'videos'}
-    output_df['resource_type'] = output_df['resource_type'].replace(RESOURCE_VALUES_MAP)
- 
+        })
+        output.append(row)
+
      # Limit the number of results for large courses
-    total_rows = df.shape[0]
+    total_rows = len(access_rows)
     if total_rows > config.RESOURCE_LIMIT:
-        output_df = output_df.sort_values("total_percent", ascending=False).head(config.RESOURCE_LIMIT)
-    output_df.drop(columns=['name', 'resource_id_type'], inplace=True)
+        output = sorted(output, key=lambda row: row['total_percent'], reverse=True)[:config.RESOURCE_LIMIT]
 
-    logger.debug(output_df.to_json(orient='records'))
-    response = HttpResponse(output_df.to_json(orient='records'), content_type='application/json')
+    logger.debug(output)
+    response = json_response(output)
 
     # Add in this header if needed to pass that we limited this to the frontend
     if total_rows > config.RESOURCE_LIMIT:
@@ -446,6 +478,7 @@ def resource_access_within_week(request, course_id=0):
 
 @permission_required('dashboard.grade_distribution',
     fn=objectgetter(Course, 'course_id','canvas_id'), raise_exception=True)
+@course_data_conditional()
 def grade_distribution(request, course_id=0):
     logger.debug(grade_distribution.__name__)
 
@@ -460,59 +493,56 @@ def grade_distribution(request, course_id=0):
        (select current_grade from user where sis_name=%(current_user)s and course_id=%(course_id)s) as current_user_grade
        from user where course_id=%(course_id)s and enrollment_type=%(enrollment_type)s
        """
-    df = pd.read_sql(grade_score_sql, app_engine, params={
+    grade_rows = fetch_all(grade_score_sql, {
             'current_user': current_user,
             'course_id': course_id,
             'enrollment_type': 'StudentEnrollment'
         })
-    if len(df) <= config.GRADE_DISTRIBUTION_MINIMUM:
+    if len(grade_rows) <= config.GRADE_DISTRIBUTION_MINIMUM:
         grade_distribution_limit_msg = f'Grade Distribution view is disabled because the course enrollment is less than {config.GRADE_DISTRIBUTION_MINIMUM}'
-        logger.error(f"Course enrollment count {len(df)} Hence the {grade_distribution_limit_msg}")
-        return HttpResponse(json.dumps({'gd_disable':'true','gd_msg': grade_distribution_limit_msg}), content_type='application/json')
-    if df.empty or df.count().current_grade < MINIMUM_GRADE_DISTRIBUTION_SCORES :
-        logger.info(f"Not enough students grades (only {df.count().current_grade}) in a course {course_id} to show the view")
-        return HttpResponse(json.dumps({}), content_type='application/json')
-
+        logger.error(f"Course enrollment count {len(grade_rows)} Hence the {grade_distribution_limit_msg}")
+        return json_response({'gd_disable':'true','gd_msg': grade_distribution_limit_msg})
+    grades = sorted(float(current_grade) for current_grade, _, _ in grade_rows if current_grade is not None)
+    if len(grades) < MINIMUM_GRADE_DISTRIBUTION_SCORES:
+        logger.info(f"Not enough students grades (only {len(grades)}) in a course {course_id} to show the view")
+        return json_response({})
+
+    _, show_number_on_bars, current_user_grade = grade_rows[0]
     grade_view_data = dict()
     summary = dict()
-    summary['current_user_grade'] = df['current_user_grade'].values[0]
-    summary['tot_students'] = df.shape[0]
-    df = df[df['current_grade'].notnull()]
-    df['current_grade'] = df['current_grade'].astype(float)
-    summary['grade_avg'] = df['current_grade'].mean().round(2)
-    summary['median_grade'] = df['current_grade'].median().round(2)
+    summary['current_user_grade'] = current_user_grade
+    summary['tot_students'] = len(grade_rows)
+    summary['grade_avg'] = round(statistics.fmean(grades), 2)
+    summary['median_grade'] = round(statistics.median(grades), 2)
     summary['show_number_on_bars'] = False
-    if df['show_number_on_bars'].values[0] == 1:
+    if show_number_on_bars == 1:
         summary['show_number_on_bars'] = True
 
-    df.sort_values(by=['current_grade'], inplace=True)
-    df.reset_index(drop=True, inplace=True)
-    if len(df[df['current_grade'] > 100.0]) > 0:
-        summary['graph_upper_limit'] = int((5 * round(float(df['current_grade'].max()) / 5) + 5))
+    if grades[-1] > 100.0:
+        summary['graph_upper_limit'] = int((5 * round(grades[-1] / 5) + 5))
     else:
-        df['current_grade'] = df['current_grade'].apply(lambda x: 99.99 if x == 100.00 else x)
+        grades = [99.99 if x == 100.00 else x for x in grades]
         summary['graph_upper_limit'] = 100
-    grades = df['current_grade'].to_list()
     logger.debug(f"Grades distribution: {grades}")
 
     binning_grade = find_binning_grade_value(grades)
     if binning_grade is not None and not binning_grade.binning_all:
-        scores_to_replace = df['current_grade'].head(binning_grade.index).to_list()
-        df['current_grade'] = df['current_grade'].replace(scores_to_replace, binning_grade.value)
-    summary['show_dash_line'] = show_dashed_line(df['current_grade'].iloc[0], binning_grade, df['current_grade'].max())
+        scores_to_replace = set(grades[:binning_grade.index])
+        grades = [binning_grade.value if x in scores_to_replace else x for x in grades]
+    summary['show_dash_line'] = show_dashed_line(grades[0], binning_grade, max(grades))
     
 
     grade_view_data['summary'] = summary
-    grade_view_data['grades'] = df['current_grade'].values.tolist()
+    grade_view_data['grades'] = grades
 
     # json for eventlog
     data = {
         "course_id": course_id,
-        "show_number_on_bars": int(df['show_number_on_bars'].values[0])
+        "show_number_on_bars": int(show_number_on_bars)
     }
     eventlog(request.user, EventLogTypes.EVENT_VIEW_GRADE_DISTRIBUTION.value, extra=data)
 
-    return HttpResponse(json.dumps(grade_view_data))
+    return json_response(grade_view_data)
 
 
 @permission_required('dashboard.update_user_default_selection_for_views',
@@ -550,7 +580,7 @@ def update_user_default_selection_for_views(request, course_id=0):
     except (ObjectDoesNotExist, Exception) as e:
         logger.info(f"updating default failed due to {e} for user {current_user} in course: {course_id} ")
         value = 'fail'
-    return HttpResponse(json.dumps({key: value}),content_type='application/json')
+    return json_response({key: value})
 
 
 @permission_required('dashboard.get_user_default_selection',
@@ -585,6 +615,28 @@ def user_percent(row):
         return row['towards_final_grade']
 
 
+def resource_grade_percents(access_rows, filter_list, total_number_student):
+    """
+    Maps (resource_id, resource_type) to the resource name and the fraction of students who accessed it in each grade
+    range, from (resource_id, resource_type, name, grade range, student count) rows.
+    """
+    # The pandas code this replaced read a missing grade as NaN, which fell through to the low grade range, unless no
+    # student in the result had a grade at all (the column then held None, which it mapped to NO_GRADE)
+    missing_grade = GRADE_LOW if any(row[3] != NO_GRADE_STRING for row in access_rows) else NO_GRADE_STRING
+    resources = {}
+    for resource_id, resource_type, name, resource_grade, student_count in access_rows:
+        if resource_type not in filter_list:
+            continue
+        if resource_grade == NO_GRADE_STRING:
+            resource_grade = missing_grade
+        resource = resources.setdefault((resource_id, resource_type), {
+            'name': name,
+            'percents': dict.fromkeys(GRADES, 0.0),
+        })
+        resource['percents'][resource_grade] += student_count / total_number_student
+    return resources
+
+
 def get_course_date_start(course_id):
     logger.debug(get_course_date_start.__name__)
     course_date_start = Course.objects.get(id=course_id).determine_date_start()
@@ -665,17 +717,6 @@ def binning_logic(grades, fifth_item_in_list):
     return BinningGrade(max(binning_list), len(binning_list), True)
 
 
-def df_default_display_settings():
-    # Only display maximum values when in debug mode
-    if settings.DEBUG:
-        pd.set_option('display.max_column', None)
-        pd.set_option('display.max_rows', None)
-        pd.set_option('display.max_seq_items', None)
-
-    pd.set_option('display.max_colwidth', 500)
-    pd.set_option('expand_frame_repr', True)
-
-
 def logout(request):
     logger.info('User %s logging out.' % request.user.username)
     auth.logout(request)
@@ -685,16 +726,16 @@ def courses_enabled(request):
     """ Returns json for all courses we currently support and are enabled """
     
     if COURSES_ENABLED:
-        data = {}
-        for cvo in CourseViewOption.objects.all():
-            data.update(cvo.json())
+        data = CourseViewOption.objects.get_courses_enabled_json()
 
         callback = request.GET.get('callback')
         # Return json
         if callback is None:
-            return HttpResponse(json.dumps(data), content_type='application/json')
+            response = HttpResponse(data, content_type='application/json')
         # Return json
         else:
-            return HttpResponse("{0}({1})".format(callback, json.dumps(data)), content_type='application/json')
+            response = HttpResponse("{0}({1})".format(callback, data), content_type='application/json')
+        patch_response_headers(response, settings.CLIENT_CACHE_TIME)
+        return response
     else:
         return HttpResponseForbidden()
@@ -2,10 +2,21 @@
 import logging
 from typing import Union
 
-from distutils.util import strtobool
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
+
+
+def strtobool(value: str) -> bool:
+    # distutils.util.strtobool, without importing distutils (and setuptools) into every web worker
+    value = value.lower()
+    if value in ('y', 'yes', 't', 'true', 'on', '1'):
+        return True
+    if value in ('n', 'no', 'f', 'false', 'off', '0'):
+        return False
+    raise ValueError(f'invalid truth value {value!r}')
+
+
 # Converts a str to bool, or just returns the bool
 
 
@@ -38,6 +38,7 @@ if [ -z "${ENV_JSON}" ]; then
     MYSQL_HOST=$(hjson -j ${ENV_FILE} | jq -r -c ".MYSQL.HOST | values")
     MYSQL_PORT=$(hjson -j ${ENV_FILE} | jq -r -c ".MYSQL.PORT | values")
     IS_CRON_POD=$(hjson -j ${ENV_FILE} | jq -r -c ".IS_CRON_POD | values")
+    ASGI=$(hjson -j ${ENV_FILE} | jq -r -c ".ASGI | values")
     DEBUGPY_ENABLE=$(hjson -j ${ENV_FILE} | jq -r -c ".DEBUGPY_ENABLE | values")
     CRONTAB_SCHEDULE=$(hjson -j ${ENV_FILE} | jq -r -c ".CRONTAB_SCHEDULE | values")
     RUN_AT_TIMES=$(hjson -j ${ENV_FILE} | jq -r -c ".RUN_AT_TIMES | values")
@@ -46,6 +47,7 @@ else
     MYSQL_HOST=$(echo "${ENV_JSON}" | jq -r -c ".MYSQL.HOST | values")
     MYSQL_PORT=$(echo "${ENV_JSON}" | jq -r -c ".MYSQL.PORT | values")
     IS_CRON_POD=$(echo "${ENV_JSON}" | jq -r -c ".IS_CRON_POD | values")
+    ASGI=$(echo "${ENV_JSON}" | jq -r -c ".ASGI | values")
     DEBUGPY_ENABLE=$(echo "${ENV_JSON}" | jq -r -c ".DEBUGPY_ENABLE | values")
     CRONTAB_SCHEDULE=$(echo "${ENV_JSON}" | jq -r -c ".CRONTAB_SCHEDULE | values")
     RUN_AT_TIMES=$(echo "${ENV_JSON}" | jq -r -c ".RUN_AT_TIMES | values")
@@ -78,9 +80,21 @@ if [ "${IS_CRON_POD:-"false"}" == "false" ]; then
         # Workers need to be set to 1 for DEBUGPY
         GUNICORN_WORKERS=1
         GUNICORN_RELOAD="--reload"
+        # Preloading (see dashboard/gunicorn_config.py) does not work with reloading
+        export GUNICORN_PRELOAD=False
         GUNICORN_TIMEOUT=0
     fi
-    exec gunicorn dashboard.wsgi:application \
+    if [ "${ASGI:-"false"}" == "false" ]; then
+        GUNICORN_APP="dashboard.wsgi:application"
+        GUNICORN_WORKER_CLASS="sync"
+    else
+        echo "Serving over ASGI"
+        GUNICORN_APP="dashboard.asgi:application"
+        GUNICORN_WORKER_CLASS="uvicorn_worker.UvicornWorker"
+    fi
+    exec gunicorn "${GUNICORN_APP}" \
+        --config python:dashboard.gunicorn_config \
+        --worker-class="${GUNICORN_WORKER_CLASS}" \
         --bind 0.0.0.0:${GUNICORN_PORT} \
         --workers="${GUNICORN_WORKERS}" \
         --timeout="${GUNICORN_TIMEOUT}" \